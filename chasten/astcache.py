@@ -0,0 +1,197 @@
+"""Cache the XML-based representation of the AST of Python source files on disk."""
+
+import contextlib
+import functools
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from lxml import etree  # type: ignore
+from pyastgrep import asts as pyastgrepasts  # type: ignore
+from pyastgrep import files as pyastgrepfiles  # type: ignore
+from pyastgrep import search as pyastgrepsearch  # type: ignore
+
+from chasten import configuration, constants
+
+# the name of the elements that store the literal values of a list
+# field in the XML-based AST; these elements are not AST nodes
+ITEM_ELEMENT = "item"
+
+# create a parser for the cached XML files that supports the very
+# deeply nested XML that pyastgrep produces for some Python programs
+XML_PARSER = etree.XMLParser(huge_tree=True)
+
+
+def cache_dir() -> Path:
+    """Return the directory that stores the cached XML-based ASTs."""
+    # the cached files are stored in a directory that is inside
+    # of the platform-specific cache directory for chasten
+    return (
+        Path(
+            configuration.user_cache_dir(
+                application_name=constants.chasten.Application_Name,
+                application_author=constants.chasten.Application_Author,
+            )
+        )
+        / constants.astcache.Directory
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def create_cache_key_prefix() -> str:
+    """Create the part of every cache key that depends on the Python and pyastgrep versions."""
+    # both the AST that Python produces and the XML that pyastgrep creates
+    # from it can change between versions and thus a cached file must
+    # only be reused by the same versions of Python and pyastgrep
+    return f"{sys.version}\0{metadata.version('pyastgrep')}"
+
+
+def create_cache_key(python_file: Path) -> str:
+    """Create the key of a cached XML-based AST from the file's path."""
+    # each file has only one cached file that is replaced when the file
+    # changes, which stops the cache from growing with every modification
+    key = f"{create_cache_key_prefix()}\0{python_file.resolve()}"
+    return hashlib.blake2b(key.encode("utf-8")).hexdigest()
+
+
+def create_cache_header(file_stat: os.stat_result) -> bytes:
+    """Create the first line of a cached file from the file's modification time and size."""
+    # a change to the file changes its modification time or its size
+    # and thus a modified file will never reuse an outdated cached file
+    return f"{file_stat.st_mtime_ns} {file_stat.st_size}\n".encode()
+
+
+def read_cached_xml(cache_file: Path, header: bytes) -> Optional[etree._Element]:
+    """Read a cached XML-based AST, returning None when it is not available or outdated."""
+    # a missing, damaged, or outdated cached file is not an error since
+    # the XML-based AST can always be created again from the source code
+    try:
+        cached_contents = cache_file.read_bytes()
+        return (
+            etree.fromstring(cached_contents[len(header) :], XML_PARSER)
+            if cached_contents.startswith(header)
+            else None
+        )
+    except (OSError, etree.XMLSyntaxError):
+        return None
+
+
+def write_cached_xml(cache_file: Path, header: bytes, xml_ast: etree._Element) -> None:
+    """Write a cached XML-based AST after its header, replacing the cached file atomically."""
+    # write to a temporary file in the same directory and then move it into
+    # place so that another run of chasten never reads a partial file;
+    # note that failing to write the cache must not stop an analysis
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        (file_descriptor, temporary_file_name) = tempfile.mkstemp(
+            dir=cache_file.parent, suffix=constants.astcache.Temporary_Extension
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(file_descriptor, "wb") as temporary_file:
+            temporary_file.write(header + etree.tostring(xml_ast))
+        os.replace(temporary_file_name, cache_file)
+    except OSError:
+        os.unlink(temporary_file_name)
+
+
+def get_xml(
+    python_file: Path, contents: bytes, cache_directory: Path
+) -> Tuple[str, etree._Element]:
+    """Return the text of a Python source file and its XML-based AST, reusing a cached AST if possible."""
+    # determine the cached file and its expected header; when the file cannot
+    # be accessed or was modified after reading its contents it is not cached
+    try:
+        file_stat = python_file.stat()
+    except OSError:
+        file_stat = None
+    cache_file = cache_directory / (
+        create_cache_key(python_file) + constants.astcache.Extension
+    )
+    header = (
+        create_cache_header(file_stat)
+        if file_stat is not None and file_stat.st_size == len(contents)
+        else None
+    )
+    xml_ast = read_cached_xml(cache_file, header) if header is not None else None
+    # the cached XML-based AST exists and thus the file only needs
+    # to be decoded, in the same fashion as pyastgrep, to get its text;
+    # note that using the cached file marks it as recently used so
+    # that pruning the cache does not remove it
+    if xml_ast is not None:
+        with contextlib.suppress(OSError):
+            os.utime(cache_file)
+        file_contents = contents.decode(pyastgrepfiles.get_encoding(contents))
+        return (file_contents, xml_ast)
+    # parse the file and convert its AST to XML; note that a file that is
+    # not valid Python raises an error and is never stored in the cache
+    (file_contents, parsed_ast) = pyastgrepfiles.parse_python_file(
+        contents, python_file, auto_dedent=False
+    )
+    node_mappings: Dict[etree._Element, object] = {}
+    xml_ast = pyastgrepasts.ast_to_xml(parsed_ast, node_mappings)
+    if header is not None:
+        write_cached_xml(cache_file, header, xml_ast)
+    return (file_contents, xml_ast)
+
+
+def prune_cache(cache_directory: Path) -> None:
+    """Remove the cached XML-based ASTs that were not used recently."""
+    # the cached files of the Python source files that were deleted, moved,
+    # or not analyzed for a long time are never used again; note that the
+    # directory is only listed once in each interval, which is recorded
+    # by the modification time of a file, instead of in every analysis
+    prune_file = cache_directory / constants.astcache.Prune_File
+    now = time.time()
+    with contextlib.suppress(OSError):
+        if prune_file.stat().st_mtime > now - constants.astcache.Prune_Interval:
+            return
+    oldest_time = now - constants.astcache.Max_Age
+    stale_paths = []
+    with contextlib.suppress(OSError):
+        stale_paths = [
+            entry.path
+            for entry in os.scandir(cache_directory)
+            if entry.stat().st_mtime < oldest_time
+        ]
+    for stale_path in stale_paths:
+        with contextlib.suppress(OSError):
+            os.unlink(stale_path)
+    with contextlib.suppress(OSError):
+        prune_file.touch()
+
+
+def is_ast_element(element: etree._Element) -> bool:
+    """Determine whether an element of an XML-based AST corresponds to a node of the AST."""
+    # the XML-based AST alternates between the elements for the nodes of the
+    # AST and the elements for their fields, starting with a node at the root,
+    # and thus a node is at an even depth; note that the literal values in a
+    # list field are also at an even depth but they are not nodes of the AST
+    depth = sum(1 for _ in element.iterancestors())
+    return depth % 2 == 0 and element.tag != ITEM_ELEMENT
+
+
+def position_from_element(
+    element: etree._Element,
+) -> Optional[pyastgrepsearch.Position]:
+    """Find the position of an AST node from its element, in the same fashion as pyastgrep."""
+    # use the position of the node when it has one and otherwise use the
+    # position of its closest ancestor node that has one; note that the
+    # parent of a node is the field element inside of its parent node
+    current_element = element
+    while current_element is not None:
+        lineno = current_element.get("lineno")
+        col_offset = current_element.get("col_offset")
+        if lineno is not None and col_offset is not None:
+            return pyastgrepsearch.Position(int(lineno), int(col_offset))
+        field_element = current_element.getparent()
+        current_element = (
+            field_element.getparent() if field_element is not None else None
+        )
+    return None
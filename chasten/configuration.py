@@ -1,5 +1,6 @@
 """Configuration for Chasten."""
 
+import functools
 import logging
 import logging.config
 import logging.handlers
@@ -18,6 +19,7 @@ def configure_tracebacks() -> None:
     install()
 
 
+@functools.lru_cache(maxsize=None)
 def user_config_dir(application_name: str, application_author: str) -> str:
     """Return the user's configuration directory using platformdirs."""
     # access the directory and then return it based on the
@@ -29,6 +31,18 @@ def user_config_dir(application_name: str, application_author: str) -> str:
     return chasten_user_config_dir_str
 
 
+@functools.lru_cache(maxsize=None)
+def user_cache_dir(application_name: str, application_author: str) -> str:
+    """Return the user's cache directory using platformdirs."""
+    # access the directory and then return it based on the
+    # provided name of the application and the application's author
+    chasten_user_cache_dir_str = platformdirs.user_cache_dir(
+        appname=application_name,
+        appauthor=application_author,
+    )
+    return chasten_user_cache_dir_str
+
+
 def configure_logging(
     debug_level: str = constants.logging.Default_Logging_Level,
     debug_dest: str = constants.logging.Default_Logging_Destination,
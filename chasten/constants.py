@@ -284,3 +284,62 @@ server = Server(
     Port=2525,
     Utf8_Encoding="utf-8",
 )
+
+
+# astcache constant
+@dataclass(frozen=True)
+class Astcache:
+    """Define the Astcache dataclass for constant(s)."""
+
+    Directory: str
+    Extension: str
+    Temporary_Extension: str
+    Prune_File: str
+    Prune_Interval: float
+    Max_Age: float
+
+
+astcache = Astcache(
+    Directory="ast",
+    Extension=".xml",
+    Temporary_Extension=".tmp",
+    Prune_File=".pruned",
+    Prune_Interval=24 * 60 * 60.0,
+    Max_Age=30 * 24 * 60 * 60.0,
+)
+
+
+# validation constant
+@dataclass(frozen=True)
+class Validation:
+    """Define the Validation dataclass for constant(s)."""
+
+    Directory: str
+    Extension: str
+    Files_Label: str
+
+
+validation = Validation(
+    Directory="validated",
+    Extension=".json",
+    Files_Label="files",
+)
+
+
+# trigram constant
+@dataclass(frozen=True)
+class Trigram:
+    """Define the Trigram dataclass for constant(s)."""
+
+    Index_File: str
+    Length: int
+    Max_Query_Trigrams: int
+    Timeout: float
+
+
+trigram = Trigram(
+    Index_File="trigram.sqlite",
+    Length=3,
+    Max_Query_Trigrams=64,
+    Timeout=30.0,
+)
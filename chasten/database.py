@@ -4,8 +4,6 @@ import subprocess
 import sys
 from pathlib import Path
 
-from sqlite_utils import Database
-
 from chasten import constants, enumerations, filesystem, output
 
 CHASTEN_SQL_SELECT_QUERY = """
@@ -39,6 +37,11 @@ small_bullet_unicode = constants.markers.Small_Bullet_Unicode
 
 def create_chasten_view(chasten_database_name: str) -> None:
     """Create a view that combines results in the database tables."""
+    # the heavy dependencies of the commands (e.g., sqlite_utils and the
+    # pandas it can use) are imported inside of the functions that use
+    # them so that loading them does not slow down every command
+    from sqlite_utils import Database
+
     database = Database(chasten_database_name)
     # create a "virtual table" (i.e., a view) that is the result
     # of running the pre-defined query; note that this query
@@ -53,6 +56,8 @@ def create_chasten_view(chasten_database_name: str) -> None:
 
 def enable_full_text_search(chasten_database_name: str) -> None:
     """Enable full-text search in the specific SQLite3 database."""
+    from sqlite_utils import Database
+
     database = Database(chasten_database_name)
     # enable full-text search on the main database table
     database["main"].enable_fts(
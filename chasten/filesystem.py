@@ -7,7 +7,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, NoReturn, Optional, Tuple, Union
 
-import flatterer  # type: ignore
 from rich.tree import Tree
 
 from chasten import configuration, constants, database, results
@@ -271,6 +270,8 @@ def write_flattened_csv_and_database(
     # contains all of the CSV files and a SQLite3 database called chasten.db
     # that contains all of the contents of the CSV files; this chasten.db
     # file is ready for browsing through the use of a tool like datasette
+    import flatterer  # type: ignore
+
     flatterer.flatten(
         combined_results_json_file_str,
         flattened_output_directory_str,
@@ -1,16 +1,17 @@
 """💫 Chasten checks the AST of a Python program."""
 
+import hashlib
+import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import typer
 import yaml
 from pyastgrep import search as pyastgrepsearch  # type: ignore
-from trogon import Trogon  # type: ignore
-from typer.main import get_group
 
 from chasten import (
+    astcache,
     checks,
     configuration,
     constants,
@@ -22,16 +23,42 @@ from chasten import (
     process,
     results,
     server,
+    trigram,
     util,
     validate,
 )
 
+# use the libyaml-based loader when it is available since it
+# parses YAML with native code instead of the pure-Python loader
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 # create a Typer object to support the command-line interface
 cli = typer.Typer(no_args_is_help=True)
 
 # create a small bullet for display in the output
 small_bullet_unicode = constants.markers.Small_Bullet_Unicode
 
+# bind the markers and the check labels that the commands use
+# to module-level names so that each use does not need to look
+# up the attributes of the constants again
+space = constants.markers.Space
+newline = constants.markers.Newline
+indent = constants.markers.Indent
+code_context = constants.markers.Code_Context
+non_zero_exit = constants.markers.Non_Zero_Exit
+checks_label = constants.checks.Checks_Label
+check_id_label = constants.checks.Check_Id
+check_name_label = constants.checks.Check_Name
+check_pattern_label = constants.checks.Check_Pattern
+
+# create a cache of the configuration files that were already loaded,
+# mapping the name of a file to its modification time, its textual
+# contents, and the dict-based representation of its contents
+_CONFIG_CACHE: Dict[str, Tuple[int, str, Dict[str, Dict[str, Any]]]] = {}
+
 
 # ---
 # Region: Helper functions {{{
@@ -94,16 +121,33 @@ def extract_configuration_details(
     # failed and any future steps cannot continue
     if not configuration_file_path.exists():
         return (False, None, None, None)  # type: ignore
-    configuration_file_yml = configuration_file_path.read_text()
-    # load the contents of the main configuration file
-    yaml_data = None
-    with open(configuration_file_str) as user_configuration_file:
-        yaml_data = yaml.safe_load(user_configuration_file)
+    # the configuration file was previously loaded and it was not
+    # modified since then, so reuse the cached contents of the file
+    configuration_file_mtime = configuration_file_path.stat().st_mtime_ns
+    cached_configuration = _CONFIG_CACHE.get(configuration_file_str)
+    if cached_configuration and cached_configuration[0] == configuration_file_mtime:
+        (_, configuration_file_yml, yaml_data) = cached_configuration
+        return (True, configuration_file_str, configuration_file_yml, yaml_data)
+    # load the text of the main configuration file once and
+    # then parse its contents to create the dict-based version
+    configuration_file_yml = configuration_file_path.read_text(encoding="utf-8")
+    yaml_data = yaml.load(configuration_file_yml, Loader=_YamlLoader)
+    # store the contents of the configuration file for later reuse
+    _CONFIG_CACHE[configuration_file_str] = (
+        configuration_file_mtime,
+        configuration_file_yml,
+        yaml_data,
+    )
     # return the file name, the textual contents of the configuration file, and
     # a dict-based representation of the configuration file
     return (True, configuration_file_str, configuration_file_yml, yaml_data)
 
 
+def clear_config_cache() -> None:
+    """Remove all of the previously loaded configuration files from the cache."""
+    _CONFIG_CACHE.clear()
+
+
 def validate_file(
     configuration_file_str: str,
     configuration_file_yml: str,
@@ -133,10 +177,12 @@ def validate_file(
 def validate_configuration_files(
     config: Path,
     verbose: bool = False,
+    validated_files: Optional[Dict[str, int]] = None,
 ) -> Tuple[
     bool, Union[Dict[str, List[Dict[str, Union[str, Dict[str, int]]]]], Dict[Any, Any]]
 ]:
-    """Validate the configuration."""
+    """Validate the configuration, recording the modification time of each file that was read."""
+    validated_files = {} if validated_files is None else validated_files
     # there is a specified configuration directory path;
     # this overrides the use of the configuration files that
     # may exist inside of the platform-specific directory
@@ -162,9 +208,9 @@ def validate_configuration_files(
         )
     output.console.print(
         ":sparkles: Configuration directory:"
-        + constants.markers.Space
+        + space
         + chasten_user_config_dir_str
-        + constants.markers.Newline
+        + newline
     )
     # extract the configuration details
     (
@@ -178,6 +224,10 @@ def validate_configuration_files(
     # to indicate the failure and an empty configuration dictionary
     if not configuration_valid:
         return (False, {})
+    # record the modification time of the contents that are validated
+    validated_files[str(Path(configuration_file_str).resolve())] = _CONFIG_CACHE[
+        configuration_file_str
+    ][0]
     # create a visualization of the user's configuration directory;
     # display details about the configuration directory in console
     display_configuration_directory(chasten_user_config_dir_str, verbose)
@@ -194,12 +244,16 @@ def validate_configuration_files(
         validate.JSON_SCHEMA_CONFIG,
         verbose,
     )
+    # an invalid main configuration file means that the overall
+    # configuration is invalid and thus there is no need to read,
+    # parse, and validate any of the checks files
+    if not config_file_validated:
+        return (False, {})
     # if one or more exist, retrieve the name of the checks files
     (_, checks_file_name_list) = validate.extract_checks_file_name(yml_data_dict)
     # iteratively extract the contents of each checks file
     # and then validate the contents of that checks file
-    checks_files_validated_list = []
-    check_files_validated = False
+    check_files_validated = True
     # create an empty dictionary that will store the list of checks
     overall_checks_dict: Union[
         Dict[str, List[Dict[str, Union[str, Dict[str, int]]]]], Dict[Any, Any]
@@ -207,7 +261,7 @@ def validate_configuration_files(
     # create abn empty list that will store the dicts of checks
     overall_checks_list: List[Dict[str, Union[str, Dict[str, int]]]] = []
     # initialize the dictionary to contain the empty list
-    overall_checks_dict[constants.checks.Checks_Label] = overall_checks_list
+    overall_checks_dict[checks_label] = overall_checks_list
     for checks_file_name in checks_file_name_list:
         (
             checks_file_extracted_valid,
@@ -219,34 +273,146 @@ def validate_configuration_files(
         # fashion and thus there is no need to continue the
         # validation of this file or any of the other check file
         if not checks_file_extracted_valid:
-            check_file_validated = False
+            check_files_validated = False
+            break
+        validated_files[str(Path(configuration_file_str).resolve())] = _CONFIG_CACHE[
+            configuration_file_str
+        ][0]
         # the checks file could be extract and thus the
         # function should proceed to validate a checks configuration file
-        else:
-            check_file_validated = validate_file(
-                configuration_file_str,
-                configuration_file_yml,
-                yml_data_dict,
-                validate.JSON_SCHEMA_CHECKS,
-                verbose,
-            )
-        # keep track of the validation of all of validation
-        # records for each of the check files
-        checks_files_validated_list.append(check_file_validated)
+        check_file_validated = validate_file(
+            configuration_file_str,
+            configuration_file_yml,
+            yml_data_dict,
+            validate.JSON_SCHEMA_CHECKS,
+            verbose,
+        )
+        # the check files are only validated if all of them are valid
+        # and thus the first invalid checks file means that there is no
+        # need to read, parse, and validate any of the remaining files
+        if not check_file_validated:
+            check_files_validated = False
+            break
         # add the listing of checks from the current yml_data_dict to
         # the overall listing of checks in the main dictionary
-        overall_checks_dict[constants.checks.Checks_Label].extend(yml_data_dict[constants.checks.Checks_Label])  # type: ignore
-    # the check files are only validated if all of them are valid
-    check_files_validated = all(checks_files_validated_list)
+        overall_checks_dict[checks_label].extend(yml_data_dict[checks_label])  # type: ignore
     # the files validated correctly; return an indicator to
     # show that validation worked and then return the overall
     # dictionary that contains the listing of valid checks
-    if config_file_validated and check_files_validated:
+    if check_files_validated:
         return (True, overall_checks_dict)
     # there was at least one validation error
     return (False, {})
 
 
+def validation_cache_file(chasten_user_config_dir_str: str) -> Path:
+    """Return the file that stores the earlier validation of a configuration directory."""
+    # each configuration directory has its own file inside of the
+    # platform-specific cache directory so that the validation is
+    # reused across separate runs of chasten on the same directory
+    key = hashlib.blake2b(
+        str(Path(chasten_user_config_dir_str).resolve()).encode("utf-8")
+    ).hexdigest()
+    return (
+        Path(
+            configuration.user_cache_dir(
+                application_name=constants.chasten.Application_Name,
+                application_author=constants.chasten.Application_Author,
+            )
+        )
+        / constants.validation.Directory
+        / (key + constants.validation.Extension)
+    )
+
+
+def read_validation_cache(
+    validation_file: Path,
+) -> Optional[Dict[str, List[Dict[str, Union[str, Dict[str, int]]]]]]:
+    """Read the checks of an earlier validation, returning None when any of its files changed."""
+    # a missing or damaged file is not an error since the configuration
+    # can always be validated again; note that the validation is only
+    # reused when every one of the files that it read is unchanged
+    try:
+        validation_data = json.loads(validation_file.read_text(encoding="utf-8"))
+        unchanged = all(
+            Path(file_str).stat().st_mtime_ns == modification_time
+            for (file_str, modification_time) in validation_data[
+                constants.validation.Files_Label
+            ].items()
+        )
+        checks_dict = validation_data[checks_label]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return checks_dict if unchanged else None
+
+
+def write_validation_cache(
+    validation_file: Path,
+    validated_files: Dict[str, int],
+    checks_dict: Dict[str, List[Dict[str, Union[str, Dict[str, int]]]]],
+) -> None:
+    """Write the checks of a validation along with the files that it read."""
+    # failing to store the validation must not stop an analysis; note that
+    # YAML can contain values (e.g., a date) that are valid in a check but
+    # cannot be encoded as JSON and thus such a validation is not stored
+    try:
+        validation_text = json.dumps(
+            {
+                constants.validation.Files_Label: validated_files,
+                checks_label: checks_dict,
+            }
+        )
+        validation_file.parent.mkdir(parents=True, exist_ok=True)
+        validation_file.write_text(validation_text, encoding="utf-8")
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def validate_configuration_files_cached(
+    config: Path,
+    verbose: bool = False,
+    reuse: bool = False,
+) -> Tuple[
+    bool, Union[Dict[str, List[Dict[str, Union[str, Dict[str, int]]]]], Dict[Any, Any]]
+]:
+    """Validate the configuration, optionally reusing an earlier validation."""
+    # without a request to reuse an earlier validation there is
+    # no need to read or write the stored validation at all
+    if not reuse:
+        return validate_configuration_files(config, verbose)
+    # determine the configuration directory in the same fashion
+    # as the function that performs the validation of its files
+    chasten_user_config_dir_str = (
+        str(config)
+        if config
+        else configuration.user_config_dir(
+            application_name=constants.chasten.Application_Name,
+            application_author=constants.chasten.Application_Author,
+        )
+    )
+    # the configuration was already validated and none of its
+    # files were modified since then, so reuse the validated checks
+    validation_file = validation_cache_file(chasten_user_config_dir_str)
+    cached_checks_dict = read_validation_cache(validation_file)
+    if cached_checks_dict is not None:
+        output.console.print(
+            ":sparkles: Reusing validated configuration directory:"
+            + space
+            + chasten_user_config_dir_str
+            + newline
+        )
+        return (True, cached_checks_dict)
+    # validate the configuration and store the checks for later reuse,
+    # making sure that only a valid configuration is ever reused
+    validated_files: Dict[str, int] = {}
+    (validated, checks_dict) = validate_configuration_files(
+        config, verbose, validated_files
+    )
+    if validated:
+        write_validation_cache(validation_file, validated_files, checks_dict)  # type: ignore
+    return (validated, checks_dict)
+
+
 def display_serve_or_publish_details(
     label: str,
     database_path: Path,
@@ -259,17 +425,15 @@ def display_serve_or_publish_details(
     output.console.print()
     output.console.print(label)
     output.console.print(
-        f"{constants.markers.Indent}{small_bullet_unicode} Database: '{output.shorten_file_name(str(database_path), 120)}'"
+        f"{indent}{small_bullet_unicode} Database: '{output.shorten_file_name(str(database_path), 120)}'"
     )
     output.console.print(
-        f"{constants.markers.Indent}{small_bullet_unicode} Metadata: '{output.shorten_file_name(str(metadata), 120)}'"
+        f"{indent}{small_bullet_unicode} Metadata: '{output.shorten_file_name(str(metadata), 120)}'"
     )
     # do not display a port if the task is publishing to fly.io
     # because that step does not support port specification
     if not publish:
-        output.console.print(
-            f"{constants.markers.Indent}{small_bullet_unicode} Port: {port}"
-        )
+        output.console.print(f"{indent}{small_bullet_unicode} Port: {port}")
 
 
 # ---
@@ -290,6 +454,9 @@ def interact(ctx: typer.Context) -> None:
     # fill-in command-line arguments and then
     # run the tool; note that this line of code
     # cannot be easily tested in an automated fashion
+    from trogon import Trogon  # type: ignore
+    from typer.main import get_group
+
     Trogon(get_group(cli), click_context=ctx).run()
 
 
@@ -344,7 +511,7 @@ def configure(  # noqa: PLR0913
             output.console.print(
                 "\n:person_shrugging: Cannot perform analysis due to configuration error(s).\n"
             )
-            sys.exit(constants.markers.Non_Zero_Exit)
+            sys.exit(non_zero_exit)
     # create the configuration directory and a starting version of the configuration file
     if task == enumerations.ConfigureTask.CREATE:
         # attempt to create the configuration directory
@@ -378,11 +545,11 @@ def configure(  # noqa: PLR0913
                 output.console.print(
                     "Use --force to recreate configuration directory and its containing files."
                 )
-            sys.exit(constants.markers.Non_Zero_Exit)
+            sys.exit(non_zero_exit)
 
 
 @cli.command()
-def analyze(  # noqa: PLR0913, PLR0915
+def analyze(  # noqa: PLR0912, PLR0913, PLR0915
     project: str = typer.Argument(help="Name of the project."),
     check_include: Tuple[enumerations.FilterableAttribute, str, int] = typer.Option(
         (None, None, 0),
@@ -439,6 +606,15 @@ def analyze(  # noqa: PLR0913, PLR0915
     ),
     verbose: bool = typer.Option(False, help="Enable verbose mode output."),
     save: bool = typer.Option(False, help="Enable saving of output file(s)."),
+    skip_validate: bool = typer.Option(
+        False, help="Reuse an earlier validation of unchanged configuration files."
+    ),
+    skip_cache: bool = typer.Option(
+        False, help="Do not reuse or store the cached XML-based ASTs of files."
+    ),
+    trigram_index: bool = typer.Option(
+        False, help="Skip files without the checks' literals using a trigram index."
+    ),
 ) -> None:
     """💫 Analyze the AST of Python source code."""
     # output the preamble, including extra parameters specific to this function
@@ -478,21 +654,22 @@ def analyze(  # noqa: PLR0913, PLR0915
     chasten_results_save = results.Chasten(configuration=chasten_configuration)
     # add extra space after the command to run the program
     output.console.print()
-    # validate the configuration
-    (validated, checks_dict) = validate_configuration_files(config, verbose)
+    # validate the configuration, reusing an earlier
+    # validation of the same files when that is requested
+    (validated, checks_dict) = validate_configuration_files_cached(
+        config, verbose, skip_validate
+    )
     # some aspect of the configuration was not
     # valid, so exit early and signal an error
     if not validated:
         output.console.print(
             "\n:person_shrugging: Cannot perform analysis due to configuration error(s).\n"
         )
-        sys.exit(constants.markers.Non_Zero_Exit)
+        sys.exit(non_zero_exit)
     # extract the list of the specific patterns (i.e., the XPATH expressions)
     # that will be used to analyze all of the XML-based representations of
     # the Python source code found in the valid directories
-    check_list: List[Dict[str, Union[str, Dict[str, int]]]] = checks_dict[
-        constants.checks.Checks_Label
-    ]
+    check_list: List[Dict[str, Union[str, Dict[str, int]]]] = checks_dict[checks_label]
     # filter the list of checks based on the include and exclude parameters
     # --> only run those checks that were included
     check_list = process.include_or_exclude_checks(  # type: ignore
@@ -513,7 +690,7 @@ def analyze(  # noqa: PLR0913, PLR0915
         output.console.print(
             "\n:person_shrugging: Cannot perform analysis due to invalid search directory.\n"
         )
-        sys.exit(constants.markers.Non_Zero_Exit)
+        sys.exit(non_zero_exit)
     # create the list of directories
     valid_directories = [input_path]
     # output the list of directories subject to checking
@@ -525,45 +702,76 @@ def analyze(  # noqa: PLR0913, PLR0915
     output.console.print()
     # create a check_status list for all of the checks
     check_status_list: List[bool] = []
+    # create, for each check, a dictionary that organizes its matches according
+    # to the file to which they correspond so that processing takes place per-file
+    # and a running count of the number of matches for the check
+    check_match_dicts: List[Dict[str, List[pyastgrepsearch.Match]]] = [
+        {} for _ in check_list
+    ]
+    check_match_counts = [0 for _ in check_list]
+    # extract the pattern of each check only once so that both the search
+    # and the processing of the results can reuse the same patterns
+    check_patterns = [
+        str(current_check[check_pattern_label])  # type: ignore
+        for current_check in check_list
+    ]
+    # find all of the Python source files in the directories only once
+    # so that each of the checks can search a subset of these files;
+    # note that without any checks there is no need to find any files
+    python_files = (
+        process.collect_python_files(valid_directories) if check_patterns else []
+    )
+    # the XML-based ASTs of unchanged files are reused from earlier analyses
+    # unless the person using chasten asked to not use the cache, which
+    # also removes the cached ASTs that were not used for a long time
+    cache_directory = None if skip_cache else astcache.cache_dir()
+    if cache_directory is not None:
+        astcache.prune_cache(cache_directory)
+    # use the trigram index to avoid reading the files that cannot contain the
+    # literals of any of the checks; note that these files cannot have any
+    # matches and that the index forgets the files no longer found in the
+    # searched directories, thus bounding the size of the index
+    if trigram_index and check_patterns:
+        python_files = trigram.filter_candidate_files(
+            trigram.index_file(),
+            valid_directories,
+            python_files,
+            [
+                process.extract_required_literals(check_pattern)
+                for check_pattern in check_patterns
+            ],
+        )
+    # search all of the Python source files with the patterns of all of the
+    # checks at once, thereby parsing each file and converting its AST to XML
+    # only once instead of once for each of the checks; note that the matches
+    # for each file are recorded as soon as that file was searched
+    for python_file, file_matches_list in process.generate_python_file_matches(
+        python_files, check_patterns, cache_directory=cache_directory
+    ):
+        for check_index, file_matches in enumerate(file_matches_list):
+            if file_matches:
+                check_match_dicts[check_index][str(python_file)] = file_matches
+                check_match_counts[check_index] += len(file_matches)
     # iterate through and perform each of the checks
-    for current_check in check_list:
-        # extract the pattern for the current check
-        current_xpath_pattern = str(current_check[constants.checks.Check_Pattern])  # type: ignore
+    for current_check, current_xpath_pattern, match_dict, match_count in zip(
+        check_list, check_patterns, check_match_dicts, check_match_counts
+    ):
+        # extract details about the check to display in the header
+        # of the syntax box for this specific check, binding them once
+        # so that the rest of the loop does not look them up again
+        check_id = current_check[check_id_label]  # type: ignore
+        check_name = current_check[check_name_label]  # type: ignore
+        check_description = checks.extract_description(current_check)
         # extract the minimum and maximum values for the checks, if they exist
         # note that this function will return None for a min or a max if
         # that attribute does not exist inside of the current_check; importantly,
         # having a count or a min or a max is all optional in a checks file
         (min_count, max_count) = checks.extract_min_max(current_check)
-        # extract details about the check to display in the header
-        # of the syntax box for this specific check
-        check_id = current_check[constants.checks.Check_Id]  # type: ignore
-        check_name = current_check[constants.checks.Check_Name]  # type: ignore
-        check_description = checks.extract_description(current_check)
-        # search for the XML contents of an AST that match the provided
-        # XPATH query using the search_python_file in search module of pyastgrep;
-        # this looks for matches across all path(s) in the specified source path
-        match_generator = pyastgrepsearch.search_python_files(
-            paths=valid_directories, expression=current_xpath_pattern, xpath2=True
-        )
-        # materialize a list from the generator of (potential) matches;
-        # note that this list will also contain an object that will
-        # indicate that the analysis completed for each located file
-        match_generator_list = list(match_generator)
-        # filter the list of matches so that it only includes
-        # those that are a Match object that will contain source code
-        (match_generator_list, _) = process.filter_matches(
-            match_generator_list, pyastgrepsearch.Match
-        )
-        # organize the matches according to the file to which they
-        # correspond so that processing of matches takes place per-file
-        match_dict = process.organize_matches(match_generator_list)
         # perform an enforceable check if it is warranted for this check
         current_check_save = None
         if checks.is_checkable(min_count, max_count):
             # determine whether or not the number of found matches is within mix and max
-            check_status = checks.check_match_count(
-                len(match_generator_list), min_count, max_count
-            )
+            check_status = checks.check_match_count(match_count, min_count, max_count)
             # keep track of the outcome for this check
             check_status_list.append(check_status)
         # this is not an enforceable check and thus the tool always
@@ -587,7 +795,7 @@ def analyze(  # noqa: PLR0913, PLR0915
         )
         # there were no matches and thus the current_check_save of None
         # should be recorded inside of the source of the results
-        if len(match_generator_list) == 0:
+        if match_count == 0:
             current_result_source.check = current_check_save
         # iteratively analyze:
         # a) A specific file name
@@ -641,12 +849,12 @@ def analyze(  # noqa: PLR0913, PLR0915
                         lineno=position_end,
                         coloffset=column_offset,
                         linematch=current_match.file_lines[position_end - 1].lstrip(
-                            constants.markers.Space
+                            space
                         ),
                         linematch_context=util.join_and_preserve(
                             current_match.file_lines,
-                            max(0, position_end - constants.markers.Code_Context),
-                            position_end + constants.markers.Code_Context,
+                            max(0, position_end - code_context),
+                            position_end + code_context,
                         ),
                     )
                     # save the entire current_match that is an instance of
@@ -670,7 +878,7 @@ def analyze(  # noqa: PLR0913, PLR0915
     all_checks_passed = all(check_status_list)
     if not all_checks_passed:
         output.console.print("\n:sweat: At least one check did not pass.")
-        sys.exit(constants.markers.Non_Zero_Exit)
+        sys.exit(non_zero_exit)
     output.console.print("\n:joy: All checks passed.")
 
 
@@ -1,14 +1,11 @@
 """Perform logging and/or console output."""
 
 import logging
-from copy import deepcopy
 from pathlib import Path
 from typing import Any, Dict, List
 
 from pyastgrep import search as pyastgrepsearch  # type: ignore
 from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
 
 from chasten import checks, configuration, constants, debug, results
 
@@ -155,6 +152,9 @@ def print_list_contents(container: List[Path]) -> None:
 def print_analysis_details(chasten: results.Chasten, verbose: bool = False) -> None:
     """Print all of the verbose debugging details for the results of an analysis."""
     global console  # noqa: disable=PLW0603
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+
     # 1) Note: see the BaseModel definitions in results.py for more details
     # about the objects and their relationships
     # 2) Note: the _match object that is inside of a Match BaseModel subclass
@@ -220,14 +220,12 @@ def print_analysis_details(chasten: results.Chasten, verbose: bool = False) -> N
                     column_offset = current_match.position.col_offset
                     # get a pre-defined number of the lines both
                     # before and after the line that is the closest match;
-                    # note that the use of "*" is an indicator of the
-                    # specific line that is the focus of the search
+                    # note that the lines of the file are shared by all of
+                    # the matches in the same file and thus they are never
+                    # modified, with the specific line that is the focus of
+                    # the search instead highlighted in the displayed syntax
                     all_lines = current_match.file_lines
-                    # create a deepcopy of the listing of lines so that
-                    # the annotated version of the lines for this specific
-                    # match does not appear in annotated version of other matches
-                    all_lines_for_marking = deepcopy(all_lines)
-                    lines = all_lines_for_marking[
+                    lines = all_lines[
                         max(
                             0, position_end - constants.markers.Code_Context
                         ) : position_end
@@ -241,7 +239,7 @@ def print_analysis_details(chasten: results.Chasten, verbose: bool = False) -> N
                     # --> highlight for the matching position
                     # --> suitable theme (could be customized)
                     code_syntax = Syntax(
-                        "\n".join(str(line) for line in lines),
+                        constants.markers.Newline.join(lines),
                         constants.chasten.Programming_Language,
                         theme=constants.chasten.Theme_Colors,
                         background_color=constants.chasten.Theme_Background,
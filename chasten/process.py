@@ -1,12 +1,357 @@
 """Analyze the abstract syntax tree, its XML-based representation, and/or the search results."""
 
+import functools
 import json
-from typing import Any, Dict, List, Tuple, Union
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from itertools import repeat
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from lxml.etree import _Element  # type: ignore
+from pathspec import PathSpec
+from pyastgrep import asts as pyastgrepasts  # type: ignore
+from pyastgrep import files as pyastgrepfiles  # type: ignore
+from pyastgrep import ignores as pyastgrepignores  # type: ignore
 from pyastgrep import search as pyastgrepsearch  # type: ignore
 from thefuzz import fuzz  # type: ignore
 
-from chasten import constants, enumerations
+from chasten import astcache, constants, enumerations
+
+# import elementpath for the type annotations only
+if TYPE_CHECKING:
+    import elementpath  # type: ignore
+
+# the suffix of the Python source files that chasten analyzes
+PYTHON_FILE_SUFFIX = ".py"
+
+# the configuration file at the top of every Python virtual environment
+VIRTUAL_ENVIRONMENT_FILE = "pyvenv.cfg"
+
+# map the names of nodes in the XML-based representation of an AST to
+# a keyword that must appear in the source code of any Python file
+# that contains that kind of node (e.g., a ClassDef needs "class")
+KEYWORD_NODES = {
+    "Assert": "assert",
+    "AsyncFor": "async",
+    "AsyncFunctionDef": "async",
+    "AsyncWith": "async",
+    "Await": "await",
+    "Break": "break",
+    "ClassDef": "class",
+    "Continue": "continue",
+    "Delete": "del",
+    "ExceptHandler": "except",
+    "For": "for",
+    "FunctionDef": "def",
+    "Global": "global",
+    "If": "if",
+    "IfExp": "if",
+    "Import": "import",
+    "ImportFrom": "import",
+    "Lambda": "lambda",
+    "Match": "match",
+    "NamedExpr": ":=",
+    "Nonlocal": "nonlocal",
+    "Raise": "raise",
+    "Return": "return",
+    "Try": "try",
+    "TryStar": "try",
+    "While": "while",
+    "With": "with",
+    "Yield": "yield",
+    "YieldFrom": "yield",
+    "comprehension": "for",
+}
+
+# detect the parts of an XPATH expression that mean a node or an attribute
+# that it mentions does not need to exist for the expression to match
+OPTIONAL_XPATH_PARTS = re.compile(
+    r"\b(?:not|empty|count|false|if|every)\s*\(|\bor\b|\bexcept\b|\bunion\b|\||!="
+)
+
+# detect the start of a call to one of the functions that compare an attribute
+# with a string, which are the only calls that the extraction understands
+RECOGNIZED_XPATH_FUNCTION_CALL = re.compile(
+    r"\b(?:contains|starts-with|ends-with)\(\s*@[A-Za-z_]+\s*,"
+)
+
+# detect the parts of an XPATH expression, outside of its quoted strings and its
+# recognized function calls, that the extraction does not understand and that
+# may let the expression match without some of the nodes that it mentions
+# (e.g., another function call, a sequence, a variable, or a type test); note
+# that a comparison with a parenthesized expression may compare two boolean
+# values and thus invert a predicate without using a function like not
+UNRECOGNIZED_XPATH_PARTS = re.compile(
+    r"[A-Za-z_][A-Za-z0-9_.-]*\s*\(|,|\$|=>|!"
+    r"|\binstance\s+of\b|\btreat\s+as\b|\bcast(?:able)?\s+as\b"
+    r"|\)\s*(?:[=<>]|\b(?:eq|ne|lt|le|gt|ge)\b)"
+    r"|(?:[=<>]|\b(?:eq|ne|lt|le|gt|ge)\b)\s*\("
+)
+
+# detect a quoted string literal inside of an XPATH expression
+QUOTED_XPATH_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+# detect a comparison of an attribute that stores an identifier (e.g., the
+# name of a function or a variable) with a quoted string literal
+IDENTIFIER_XPATH_LITERAL = re.compile(
+    r"(?:@(?:name|id|attr|arg)\s*=\s*"
+    r"|(?:contains|starts-with|ends-with)\(\s*@(?:name|id|attr|arg)\s*,\s*)"
+    r"(['\"])([A-Za-z_][A-Za-z0-9_]*)\1"
+)
+
+# detect a name that may refer to a node in an XPATH expression
+XPATH_NAME = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+
+class VirtualEnvironmentSpec(PathSpec):
+    """Match the directories that contain a Python virtual environment."""
+
+    def match_file(self, file: Any, separators: Any = None) -> bool:
+        """Determine whether the path is a directory with a virtual environment."""
+        # a virtual environment always has a configuration file at its top
+        # and thus a directory with this file contains installed packages
+        # instead of the project's own source code; note that the Python
+        # source files themselves can never contain a virtual environment
+        file_path = Path(file)
+        return (
+            file_path.suffix != PYTHON_FILE_SUFFIX
+            and (file_path / VIRTUAL_ENVIRONMENT_FILE).is_file()
+        )
+
+
+def collect_python_files(paths: List[Path]) -> List[Path]:
+    """Find all of the Python source files in the provided paths."""
+    # use the same directory walker as pyastgrep so that hidden files and the
+    # files ignored by git are also skipped, but also skip the directories
+    # that contain a virtual environment without walking any of their files;
+    # note that the paths are only walked once, even if they repeat
+    directory_walker = pyastgrepignores.DirWalker(
+        glob=f"*{PYTHON_FILE_SUFFIX}", pathspecs=[VirtualEnvironmentSpec([])]
+    )
+    working_directory = Path(os.getcwd())
+    python_files: Dict[Path, None] = {}
+    for path in dict.fromkeys(paths):
+        # a provided file is always searched and a provided path that
+        # does not exist, like with pyastgrep, does not have any files
+        if path.is_file():
+            found_paths: Iterable[Path] = [path]
+        elif path.is_dir():
+            found_paths = directory_walker.for_dir(path, working_directory).walk()
+        else:
+            continue
+        # a path may be found more than once when the provided paths overlap
+        # (e.g., a directory and a file inside of it) and thus only the first
+        # one is kept, preserving the order in which the files were found
+        python_files.update(dict.fromkeys(found_paths))
+    return list(python_files)
+
+
+def extract_required_literals(xpath: str) -> List[str]:
+    """Extract the literals that a Python source file must contain to match the XPATH expression."""
+    # the expression may match even when some of the nodes or attributes
+    # that it mentions do not exist (e.g., through a not or an or) or it
+    # contains a construct that the extraction does not understand and
+    # thus it is not safe to require any of the literals in the expression
+    xpath_without_literals = QUOTED_XPATH_LITERAL.sub(constants.markers.Space, xpath)
+    if OPTIONAL_XPATH_PARTS.search(xpath) or UNRECOGNIZED_XPATH_PARTS.search(
+        RECOGNIZED_XPATH_FUNCTION_CALL.sub(
+            constants.markers.Space, xpath_without_literals
+        )
+    ):
+        return []
+    # the identifiers that an attribute must equal or contain must
+    # appear in the source code in the same form that they appear
+    # in the XPATH expression (e.g., the name of a function)
+    required_literals = [
+        match.group(2) for match in IDENTIFIER_XPATH_LITERAL.finditer(xpath)
+    ]
+    # the nodes named outside of quoted strings in the expression each
+    # require a keyword in the source code (e.g., an If needs "if")
+    required_literals.extend(
+        KEYWORD_NODES[xpath_name]
+        for xpath_name in XPATH_NAME.findall(xpath_without_literals)
+        if xpath_name in KEYWORD_NODES
+    )
+    # return the unique literals while preserving their order
+    return list(dict.fromkeys(required_literals))
+
+
+def contains_required_literals(contents: bytes, required_literals: List[str]) -> bool:
+    """Determine whether the contents of a Python source file contain all of the required literals."""
+    # a file with non-ASCII content always contains the literals since Python
+    # normalizes identifiers and thus a name in the AST may be
+    # written in a different form in the source code of the file
+    return not contents.isascii() or all(
+        literal.encode() in contents for literal in required_literals
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def compile_xpath(xpath_pattern: str) -> "elementpath.Selector":
+    """Compile an XPATH expression so that it can be evaluated for many files."""
+    import elementpath  # type: ignore
+
+    # use the XPATH 2.0 selector since this is the version of XPATH
+    # that pyastgrep uses when searching with the xpath2 option
+    return elementpath.Selector(xpath_pattern)
+
+
+def find_match_position(
+    element: Any, node_mappings: Dict[_Element, Any], cached: bool
+) -> Tuple[Optional[pyastgrepsearch.Position], Any]:
+    """Find the position and the AST node of an element that matched, with a None position for a non-match."""
+    # only elements that correspond to an AST node with a position
+    # in the source code are matches, mirroring pyastgrep's search
+    if not isinstance(element, _Element):
+        return (None, None)
+    # an XML-based AST from the cache does not have AST nodes and thus
+    # the element itself must reveal whether it corresponds to a node
+    ast_node = None if cached else node_mappings.get(element)
+    is_node = astcache.is_ast_element(element) if cached else ast_node is not None
+    # find the position from the element in both cases, since the AST nodes
+    # that Python shares across a tree (e.g., Load and Store) do not know
+    # their own parent, ensuring that the cache never changes a position
+    return (astcache.position_from_element(element) if is_node else None, ast_node)
+
+
+def search_python_file(
+    python_file: Path,
+    xpath_selectors: List["elementpath.Selector"],
+    required_literals_list: List[List[str]],
+    cache_directory: Optional[Path] = None,
+) -> List[List[pyastgrepsearch.Match]]:
+    """Parse a Python source file once and search its XML-based AST with each of the XPATH selectors."""
+    matches_list: List[List[pyastgrepsearch.Match]] = [[] for _ in xpath_selectors]
+    # read the contents of the file only once; note that, like pyastgrep,
+    # a file that cannot be read does not have any matches
+    try:
+        contents = python_file.read_bytes()
+    except OSError:
+        return matches_list
+    # determine which of the patterns could possibly match this file
+    # and do not parse the file when none of them could match it
+    searchable_indices = [
+        index
+        for index, required_literals in enumerate(required_literals_list)
+        if contains_required_literals(contents, required_literals)
+    ]
+    if not searchable_indices:
+        return matches_list
+    # parse the file and convert its AST to XML only once for all of the patterns;
+    # note that, like pyastgrep, a file that is not valid Python does not have
+    # any matches, including a file that cannot be decoded as text; note that
+    # with a cache directory the XML-based AST from an earlier run is reused
+    # for an unchanged file and the matches do not have an AST node
+    node_mappings: Dict[_Element, Any] = {}
+    cached = cache_directory is not None
+    try:
+        if cache_directory is not None:
+            (file_contents, xml_ast) = astcache.get_xml(
+                python_file, contents, cache_directory
+            )
+        else:
+            (file_contents, parsed_ast) = pyastgrepfiles.parse_python_file(
+                contents, python_file, auto_dedent=False
+            )
+            xml_ast = pyastgrepasts.ast_to_xml(parsed_ast, node_mappings)
+    except (SyntaxError, ValueError):
+        return matches_list
+    file_lines = file_contents.splitlines()
+    # build the tree of nodes that the XPATH selectors navigate only
+    # once instead of building it again for each of the selectors
+    import elementpath  # type: ignore
+
+    xml_node_tree = elementpath.get_node_tree(xml_ast)
+    # search the XML-based AST with each of the selectors that could match;
+    # note that an expression that does not return nodes (e.g., a count)
+    # cannot match and that only the elements with a position are matches
+    for index in searchable_indices:
+        matching_elements = xpath_selectors[index].select(xml_node_tree)
+        element_positions = (
+            (element, find_match_position(element, node_mappings, cached))
+            for element in (
+                matching_elements if isinstance(matching_elements, list) else []
+            )
+        )
+        matches_list[index].extend(
+            pyastgrepsearch.Match(python_file, file_lines, element, position, ast_node)
+            for (element, (position, ast_node)) in element_positions
+            if position is not None
+        )
+    return matches_list
+
+
+def search_python_file_in_worker(
+    python_file: Path,
+    xpath_patterns: List[str],
+    required_literals_list: List[List[str]],
+    cache_directory: Optional[Path] = None,
+) -> List[List[pyastgrepsearch.Match]]:
+    """Search a Python source file with each of the XPATH patterns inside of a worker process."""
+    # compile the patterns; note that the compiled selectors are cached
+    # and thus each worker process only compiles each pattern once
+    xpath_selectors = [compile_xpath(xpath_pattern) for xpath_pattern in xpath_patterns]
+    # the XML elements and the AST nodes cannot be sent back from a worker
+    # process and thus each match only keeps its path, lines, and position
+    return [
+        [replace(match, xml_element=None, ast_node=None) for match in matches]
+        for matches in search_python_file(
+            python_file, xpath_selectors, required_literals_list, cache_directory
+        )
+    ]
+
+
+def generate_python_file_matches(
+    python_files: List[Path],
+    xpath_patterns: List[str],
+    workers: Optional[int] = None,
+    cache_directory: Optional[Path] = None,
+) -> Iterator[Tuple[Path, List[List[pyastgrepsearch.Match]]]]:
+    """Search the Python source files with each of the XPATH patterns, yielding the matches for each file."""
+    # determine the literals that a file must contain for each pattern to match
+    required_literals_list = [
+        extract_required_literals(xpath_pattern) for xpath_pattern in xpath_patterns
+    ]
+    # use a worker process for each of the CPUs unless the number was specified
+    workers = workers or os.cpu_count() or 1
+    # there are many files and many CPUs and thus the files are searched in
+    # parallel worker processes; note that map returns the results in
+    # the order of the files, which keeps the output deterministic
+    if workers > 1 and len(python_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            files_matches_list = executor.map(
+                search_python_file_in_worker,
+                python_files,
+                repeat(xpath_patterns),
+                repeat(required_literals_list),
+                repeat(cache_directory),
+                chunksize=max(1, len(python_files) // (workers * 4)),
+            )
+            yield from zip(python_files, files_matches_list)
+        return
+    # search the files one at a time in this process after compiling
+    # each of the patterns only once before searching any of the files
+    xpath_selectors = [compile_xpath(xpath_pattern) for xpath_pattern in xpath_patterns]
+    for python_file in python_files:
+        yield (
+            python_file,
+            search_python_file(
+                python_file, xpath_selectors, required_literals_list, cache_directory
+            ),
+        )
 
 
 def include_or_exclude_checks(
@@ -43,57 +388,6 @@ def include_or_exclude_checks(
     return filtered_checks
 
 
-def filter_matches(
-    match_list: List[Union[pyastgrepsearch.Match, Any]],
-    data_type,
-) -> Tuple[List[pyastgrepsearch.Match], List[Any]]:
-    """Filter the list of matches based on the provided data type."""
-    subset_match_list = []
-    did_not_match_list = []
-    # iterate through all of the matches
-    for match in match_list:
-        # if the current match is of the
-        # specified type, then keep it in
-        # the list of the matching matches
-        if isinstance(match, data_type):
-            subset_match_list.append(match)
-        # if the current match is not of the
-        # specified type, then keep it in
-        # the list of non-matching matches
-        else:
-            did_not_match_list.append(match)
-    # return both of the created lists
-    return (subset_match_list, did_not_match_list)
-
-
-def organize_matches(
-    match_list: List[pyastgrepsearch.Match],
-) -> Dict[str, List[pyastgrepsearch.Match]]:
-    """Organize the matches on a per-file basis to support simplified processing."""
-    match_dict: Dict[str, List[pyastgrepsearch.Match]] = {}
-    # iterate through each of the matches in the list, with
-    # the goal of creating a dictionary organized so that
-    # --> the key is the name of a file under analysis
-    # --> the value is a list of all of the matches for that file
-    for current_match in match_list:
-        # extract the name of the file for the current match
-        current_match_file_name = str(current_match.path)
-        # already storing matches for this file
-        if current_match_file_name in match_dict:
-            # extract the existing list of matches for this file
-            current_match_file_list = match_dict[current_match_file_name]
-            current_match_file_list.append(current_match)
-        # not already storing matches for this file
-        else:
-            # create an empty list for storing the matches
-            current_match_list: List[pyastgrepsearch.Match] = []
-            # add the current match to the list
-            current_match_list.append(current_match)
-            # associate this new list with the current file name
-            match_dict[current_match_file_name] = current_match_list
-    return match_dict
-
-
 def combine_dicts(dict_list: List[Dict[Any, Any]]) -> str:
     """Combine all dictionaries in the list into a single list of dictionaries as a string."""
     # combine all of the dictionaries in the list into
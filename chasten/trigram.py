@@ -0,0 +1,207 @@
+"""Find the Python source files that can contain literals with a persistent trigram index."""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from chasten import configuration, constants
+
+# the tables of the index; note that the trigrams are stored as a
+# clustered index of (trigram, file) pairs without a separate rowid so that
+# finding the files that contain a trigram only reads a range of one index
+CREATE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS files (
+  id INTEGER PRIMARY KEY,
+  path TEXT UNIQUE NOT NULL,
+  mtime INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  ascii INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trigrams (
+  tri INTEGER NOT NULL,
+  file_id INTEGER NOT NULL,
+  PRIMARY KEY (tri, file_id)
+) WITHOUT ROWID;
+"""
+
+# the query that finds the files that contain a single trigram
+SELECT_FILES_WITH_TRIGRAM_SQL = "SELECT file_id FROM trigrams WHERE tri = ?"
+
+
+def index_file() -> Path:
+    """Return the file that stores the trigram index."""
+    # the index is stored inside of the platform-specific cache directory
+    # for chasten so that it persists across analyses of the same project
+    return (
+        Path(
+            configuration.user_cache_dir(
+                application_name=constants.chasten.Application_Name,
+                application_author=constants.chasten.Application_Author,
+            )
+        )
+        / constants.trigram.Index_File
+    )
+
+
+def extract_trigrams(contents: bytes) -> Set[int]:
+    """Extract the distinct trigrams of bytes that the contents contain."""
+    # collect each distinct sequence of three bytes and then convert each
+    # one of them to an integer that can be efficiently stored and compared
+    length = constants.trigram.Length
+    trigram_bytes = {
+        contents[index : index + length] for index in range(len(contents) - length + 1)
+    }
+    return {int.from_bytes(trigram, "big") for trigram in trigram_bytes}
+
+
+def connect_index(index_file_path: Path) -> sqlite3.Connection:
+    """Connect to the trigram index, creating it when it does not exist."""
+    index_file_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(
+        str(index_file_path), timeout=constants.trigram.Timeout
+    )
+    connection.executescript(CREATE_TABLES_SQL)
+    return connection
+
+
+def update_index(
+    connection: sqlite3.Connection, search_paths: List[Path], python_files: List[Path]
+) -> Dict[Path, Optional[int]]:
+    """Index the Python source files that changed, returning the identifier of each file in the index."""
+    # load the modification time and the size of every indexed file so that
+    # only the files that were added or modified since then are read again
+    indexed_files = {
+        path: (file_id, mtime, size, is_ascii)
+        for (file_id, path, mtime, size, is_ascii) in connection.execute(
+            "SELECT id, path, mtime, size, ascii FROM files"
+        )
+    }
+    # map each file to its identifier in the index; a file without an
+    # identifier cannot be filtered with the index and is always a candidate
+    file_ids: Dict[Path, Optional[int]] = {}
+    seen_file_paths: Set[str] = set()
+    for python_file in python_files:
+        file_path = str(python_file.resolve())
+        seen_file_paths.add(file_path)
+        try:
+            file_stat = python_file.stat()
+        except OSError:
+            file_ids[python_file] = None
+            continue
+        indexed_file = indexed_files.get(file_path)
+        # the file did not change since it was indexed and thus the
+        # trigrams in the index are still correct for this file
+        if indexed_file is not None and indexed_file[1:3] == (
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+        ):
+            file_ids[python_file] = indexed_file[0] if indexed_file[3] else None
+            continue
+        try:
+            contents = python_file.read_bytes()
+        except OSError:
+            file_ids[python_file] = None
+            continue
+        # a file with non-ASCII content always contains the literals, in the
+        # same fashion as the filtering of the files before parsing them, and
+        # thus its trigrams are not needed for finding the candidate files
+        is_ascii = contents.isascii()
+        file_trigrams = extract_trigrams(contents) if is_ascii else set()
+        # insert or update the file; note that another run of chasten may
+        # have indexed the same file since its indexed files were loaded
+        connection.execute(
+            "INSERT INTO files (path, mtime, size, ascii) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET "
+            "mtime = excluded.mtime, size = excluded.size, ascii = excluded.ascii",
+            (file_path, file_stat.st_mtime_ns, file_stat.st_size, is_ascii),
+        )
+        (file_id,) = connection.execute(
+            "SELECT id FROM files WHERE path = ?", (file_path,)
+        ).fetchone()
+        connection.execute("DELETE FROM trigrams WHERE file_id = ?", (file_id,))
+        connection.executemany(
+            "INSERT OR IGNORE INTO trigrams (tri, file_id) VALUES (?, ?)",
+            ((trigram, file_id) for trigram in file_trigrams),
+        )
+        # record the indexed file in case that another path refers to it
+        indexed_files[file_path] = (
+            file_id,
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+            is_ascii,
+        )
+        file_ids[python_file] = file_id if is_ascii else None
+    # remove the files inside of the searched paths that were not found during
+    # this search since they were deleted, moved, or are now ignored
+    resolved_search_paths = [search_path.resolve() for search_path in search_paths]
+    stale_file_ids = [
+        (indexed_file[0],)
+        for (file_path, indexed_file) in indexed_files.items()
+        if file_path not in seen_file_paths
+        and any(
+            Path(file_path).is_relative_to(search_path)
+            for search_path in resolved_search_paths
+        )
+    ]
+    connection.executemany("DELETE FROM trigrams WHERE file_id = ?", stale_file_ids)
+    connection.executemany("DELETE FROM files WHERE id = ?", stale_file_ids)
+    connection.commit()
+    return file_ids
+
+
+def extract_required_trigrams(required_literals: List[str]) -> List[int]:
+    """Extract the trigrams that a file must contain to contain all of the required literals."""
+    # a literal that is shorter than a trigram does not have any trigrams and
+    # thus it cannot narrow the files; note that only a bounded number of
+    # trigrams are used since each one adds to the size of the query
+    return sorted(
+        set().union(
+            *(
+                extract_trigrams(required_literal.encode())
+                for required_literal in required_literals
+            )
+        )
+    )[: constants.trigram.Max_Query_Trigrams]
+
+
+def query_file_ids(
+    connection: sqlite3.Connection, required_trigrams: List[int]
+) -> Set[int]:
+    """Find the identifiers of the files that contain every one of the required trigrams."""
+    # intersect the list of files that contain each of the trigrams
+    query = " INTERSECT ".join(SELECT_FILES_WITH_TRIGRAM_SQL for _ in required_trigrams)
+    return {file_id for (file_id,) in connection.execute(query, required_trigrams)}
+
+
+def filter_candidate_files(
+    index_file_path: Path,
+    search_paths: List[Path],
+    python_files: List[Path],
+    required_literals_list: List[List[str]],
+) -> List[Path]:
+    """Filter the Python source files to those that could contain the required literals of at least one pattern."""
+    # a pattern without any trigrams to find could match every one of the
+    # files and thus the index cannot narrow the files that are searched
+    required_trigrams_list = [
+        extract_required_trigrams(required_literals)
+        for required_literals in required_literals_list
+    ]
+    if not all(required_trigrams_list):
+        return python_files
+    # bring the index up to date and then find the files that could match
+    # at least one of the patterns because they contain all of its trigrams
+    connection = connect_index(index_file_path)
+    try:
+        file_ids = update_index(connection, search_paths, python_files)
+        matching_file_ids: Set[int] = set()
+        for required_trigrams in required_trigrams_list:
+            matching_file_ids.update(query_file_ids(connection, required_trigrams))
+    finally:
+        connection.close()
+    # keep the files, in their original order, that either contain the
+    # trigrams or cannot be filtered with the index (e.g., non-ASCII files)
+    return [
+        python_file
+        for python_file in python_files
+        if file_ids[python_file] is None or file_ids[python_file] in matching_file_ids
+    ]
@@ -3,7 +3,7 @@
 from typing import Any, Dict, List, Tuple
 
 import jsonschema
-from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import best_match
 
 from chasten import constants
 
@@ -118,23 +118,53 @@ def extract_checks_file_name(
     return (False, [constants.markers.Empty_String])
 
 
+def create_validator(schema: Dict[str, Any]) -> Any:
+    """Create a validator for the provided JSON schema after checking the schema."""
+    # pick the validator class for the draft that the schema
+    # uses, defaulting to the latest draft, and confirm that the
+    # schema is valid before building a validator instance for it
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+# build the validators for the built-in schemas once so that
+# each validated file does not check and compile the schema again;
+# the validators are looked up by the identity of their schema
+VALIDATORS: Dict[int, Any] = {
+    id(JSON_SCHEMA_CONFIG): create_validator(JSON_SCHEMA_CONFIG),
+    id(JSON_SCHEMA_CHECKS): create_validator(JSON_SCHEMA_CHECKS),
+}
+
+
+def get_validator(schema: Dict[str, Any]) -> Any:
+    """Get the pre-built validator for a built-in schema or create a new one."""
+    # reuse the validator built for this exact schema object
+    validator = VALIDATORS.get(id(schema))
+    if validator is not None and validator.schema is schema:
+        return validator
+    # the schema is not one of the built-in schemas
+    return create_validator(schema)
+
+
 def validate_configuration(
     configuration: Dict[str, Dict[str, Any]],
     schema: Dict[str, Any] = JSON_SCHEMA_CONFIG,
 ) -> Tuple[bool, str]:
     """Validate the main configuration."""
+    # find the most relevant validation error, in the same fashion
+    # as jsonschema.validate, with a validator for the schema
+    validation_error = best_match(get_validator(schema).iter_errors(configuration))
     # indicate that validation passed; since there
     # were no validation errors, return an empty string
-    try:
-        jsonschema.validate(configuration, schema)
+    if validation_error is None:
         return (True, constants.markers.Empty_String)
     # indicate that validation failed;
     # since validation errors exist, package them up
     # and return them along with the indication
-    except ValidationError as validation_error:
-        error_message = str(validation_error)
-        error_message = error_message.lstrip()
-        return (False, error_message)
+    error_message = str(validation_error)
+    error_message = error_message.lstrip()
+    return (False, error_message)
 
 
 def validate_checks_configuration(
@@ -0,0 +1,22 @@
+"""Define the test fixtures that are shared by the test suite."""
+
+import pytest
+
+from chasten import process
+
+
+@pytest.fixture
+def collect_matches():
+    """Define a test fixture that searches Python source files and collects the matches of each pattern."""
+
+    def collect(python_files, xpath_patterns, **kwargs):
+        """Collect the path, position, and lines of the matches of each pattern in the order of the files."""
+        matches_list = [[] for _ in xpath_patterns]
+        for _, file_matches_list in process.generate_python_file_matches(
+            python_files, xpath_patterns, **kwargs
+        ):
+            for matches, file_matches in zip(matches_list, file_matches_list):
+                matches.extend((m.path, m.position, m.file_lines) for m in file_matches)
+        return matches_list
+
+    return collect
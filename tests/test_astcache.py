@@ -0,0 +1,178 @@
+"""Pytest test suite for the astcache module."""
+
+import os
+
+import pytest
+from lxml import etree
+from pyastgrep import search as pyastgrepsearch
+
+from chasten import astcache, process
+
+SOURCE_CODE = """
+class Foo:
+    def bar(self, value: int = 1):
+        if self:
+            return value[1:2]
+        for item in [1, 2]:
+            print(item)
+"""
+
+
+def test_get_xml_reuses_cached_xml(tmp_path):
+    """Confirm that the XML-based AST of an unchanged file is read from the cache."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text(SOURCE_CODE)
+    cache_directory = tmp_path / "cache"
+    contents = source_file.read_bytes()
+    (file_contents, xml_ast) = astcache.get_xml(source_file, contents, cache_directory)
+    assert file_contents == SOURCE_CODE
+    cache_files = list(cache_directory.iterdir())
+    assert len(cache_files) == 1
+    header = astcache.create_cache_header(source_file.stat())
+    assert cache_files[0].read_bytes() == header + etree.tostring(xml_ast)
+    # replace the cached file so that reading it from the cache is observable
+    cache_files[0].write_bytes(header + b"<Module><body/></Module>")
+    (file_contents, xml_ast) = astcache.get_xml(source_file, contents, cache_directory)
+    assert file_contents == SOURCE_CODE
+    assert etree.tostring(xml_ast) == b"<Module><body/></Module>"
+
+
+def test_get_xml_does_not_reuse_xml_of_modified_file(tmp_path):
+    """Confirm that a modified file does not reuse the cached XML-based AST and replaces it."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text("x = 1\n")
+    cache_directory = tmp_path / "cache"
+    astcache.get_xml(source_file, source_file.read_bytes(), cache_directory)
+    source_file.write_text("y = 2\n")
+    first_mtime = source_file.stat().st_mtime_ns
+    os.utime(source_file, ns=(first_mtime + 1_000_000, first_mtime + 1_000_000))
+    (_, xml_ast) = astcache.get_xml(
+        source_file, source_file.read_bytes(), cache_directory
+    )
+    assert xml_ast.xpath(".//Name/@id") == ["y"]
+    (cache_file,) = cache_directory.iterdir()
+    assert cache_file.read_bytes() == astcache.create_cache_header(
+        source_file.stat()
+    ) + etree.tostring(xml_ast)
+
+
+def test_get_xml_replaces_damaged_cached_xml(tmp_path):
+    """Confirm that a damaged cached file is created again from the source code."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text("x = 1\n")
+    cache_directory = tmp_path / "cache"
+    contents = source_file.read_bytes()
+    astcache.get_xml(source_file, contents, cache_directory)
+    (cache_file,) = cache_directory.iterdir()
+    header = astcache.create_cache_header(source_file.stat())
+    cache_file.write_bytes(header + b"<Module><bo")
+    (_, xml_ast) = astcache.get_xml(source_file, contents, cache_directory)
+    assert xml_ast.xpath(".//Name/@id") == ["x"]
+    assert cache_file.read_bytes() == header + etree.tostring(xml_ast)
+
+
+def test_get_xml_does_not_cache_invalid_file(tmp_path):
+    """Confirm that a file that is not valid Python raises an error and is not cached."""
+    source_file = tmp_path / "invalid.py"
+    source_file.write_text("def broken(:\n")
+    cache_directory = tmp_path / "cache"
+    with pytest.raises(SyntaxError):
+        astcache.get_xml(source_file, source_file.read_bytes(), cache_directory)
+    assert not cache_directory.exists() or not list(cache_directory.iterdir())
+
+
+def test_is_ast_element_distinguishes_nodes_and_fields():
+    """Confirm that only the elements for the nodes of the AST are recognized."""
+    xml_ast = etree.fromstring(
+        "<Module><body><Expr><value><Subscript><slice><Name/></slice></Subscript>"
+        "</value></Expr></body><type_ignores><item>1</item></type_ignores></Module>"
+    )
+    assert astcache.is_ast_element(xml_ast)
+    assert not astcache.is_ast_element(xml_ast.find("body"))
+    assert astcache.is_ast_element(xml_ast.find(".//Subscript"))
+    assert not astcache.is_ast_element(xml_ast.find(".//slice"))
+    assert astcache.is_ast_element(xml_ast.find(".//Name"))
+    assert not astcache.is_ast_element(xml_ast.find(".//item"))
+
+
+def test_position_from_element_uses_closest_node_with_position():
+    """Confirm that a node without a position uses the position of its closest ancestor node."""
+    xml_ast = etree.fromstring(
+        '<Module><body><FunctionDef lineno="3" col_offset="4"><args><arguments/>'
+        "</args></FunctionDef></body></Module>"
+    )
+    assert astcache.position_from_element(
+        xml_ast.find(".//arguments")
+    ) == pyastgrepsearch.Position(3, 4)
+    assert astcache.position_from_element(xml_ast) is None
+
+
+def test_generate_python_file_matches_with_cache_matches_without_cache(
+    tmp_path, collect_matches
+):
+    """Confirm that searching with a cold or a warm cache finds the same matches as searching without it."""
+    (tmp_path / "source.py").write_text(SOURCE_CODE)
+    (tmp_path / "invalid.py").write_text("def broken(:\n")
+    xpath_patterns = [
+        ".//ClassDef",
+        ".//FunctionDef/body//If",
+        ".//arg",
+        ".//arguments",
+        ".//Slice",
+        ".//slice",
+        ".//Constant",
+        ".//Load",
+        ".//Store",
+    ]
+    python_files = process.collect_python_files([tmp_path])
+    cache_directory = tmp_path.parent / f"{tmp_path.name}-cache"
+    expected_matches_list = collect_matches(python_files, xpath_patterns, workers=1)
+    cold_matches_list = collect_matches(
+        python_files, xpath_patterns, workers=1, cache_directory=cache_directory
+    )
+    warm_matches_list = collect_matches(
+        python_files, xpath_patterns, workers=1, cache_directory=cache_directory
+    )
+    assert cold_matches_list == expected_matches_list
+    assert warm_matches_list == expected_matches_list
+    match_counts = [len(matches) for matches in warm_matches_list]
+    assert match_counts == [1, 1, 2, 1, 1, 0, 5, 7, 1]
+    # a shared context node has the position of the node that contains it
+    assert [position for (_, position, _) in warm_matches_list[-1]] == [
+        pyastgrepsearch.Position(6, 12)
+    ]
+
+
+def test_get_xml_marks_cached_xml_as_used(tmp_path):
+    """Confirm that reading a cached XML-based AST refreshes its modification time."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text("x = 1\n")
+    cache_directory = tmp_path / "cache"
+    contents = source_file.read_bytes()
+    astcache.get_xml(source_file, contents, cache_directory)
+    (cache_file,) = cache_directory.iterdir()
+    os.utime(cache_file, (0, 0))
+    astcache.get_xml(source_file, contents, cache_directory)
+    assert cache_file.stat().st_mtime > 0
+
+
+def test_prune_cache_removes_unused_files_once_in_each_interval(tmp_path):
+    """Confirm that pruning the cache removes only the files that were not used recently."""
+    cache_directory = tmp_path / "cache"
+    cache_directory.mkdir()
+    used_file = cache_directory / "used.xml"
+    used_file.write_bytes(b"")
+    unused_file = cache_directory / "unused.xml"
+    unused_file.write_bytes(b"")
+    os.utime(unused_file, (0, 0))
+    astcache.prune_cache(cache_directory)
+    assert sorted(path.name for path in cache_directory.iterdir()) == [
+        ".pruned",
+        "used.xml",
+    ]
+    # the cache was pruned recently and thus it is not listed again
+    os.utime(used_file, (0, 0))
+    astcache.prune_cache(cache_directory)
+    assert used_file.exists()
+    # a missing cache directory is not an error
+    astcache.prune_cache(tmp_path / "missing")
@@ -21,6 +21,25 @@ def test_fuzz_create_use_config_dir(
     assert applicationname in user_config_dir_str
 
 
+def test_user_config_dir_is_cached() -> None:
+    """Confirm that the configuration directory is only computed once for the same application."""
+    configuration.user_config_dir.cache_clear()
+    first_user_config_dir_str = configuration.user_config_dir("chasten", "author")
+    second_user_config_dir_str = configuration.user_config_dir("chasten", "author")
+    assert first_user_config_dir_str == second_user_config_dir_str
+    assert configuration.user_config_dir.cache_info().hits == 1
+
+
+def test_user_cache_dir_is_cached() -> None:
+    """Confirm that the cache directory is only computed once for the same application."""
+    configuration.user_cache_dir.cache_clear()
+    first_user_cache_dir_str = configuration.user_cache_dir("chasten", "author")
+    second_user_cache_dir_str = configuration.user_cache_dir("chasten", "author")
+    assert first_user_cache_dir_str == second_user_cache_dir_str
+    assert "chasten" in first_user_cache_dir_str
+    assert configuration.user_cache_dir.cache_info().hits == 1
+
+
 @given(
     debug_level=strategies.sampled_from(
         ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
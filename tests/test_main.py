@@ -8,7 +8,7 @@ import pytest
 from hypothesis import HealthCheck, given, settings, strategies
 from typer.testing import CliRunner
 
-from chasten import main
+from chasten import configuration, main
 
 runner = CliRunner()
 
@@ -80,6 +80,16 @@ def cwd():
     return os.getcwd()
 
 
+@pytest.fixture(autouse=True)
+def user_cache_dir(tmp_path, monkeypatch):
+    """Define a test fixture that keeps the cached files of each test out of the user's cache directory."""
+    cache_directory = tmp_path / "cache"
+    monkeypatch.setattr(
+        configuration, "user_cache_dir", lambda **_: str(cache_directory)
+    )
+    return cache_directory
+
+
 def test_cli_analyze_correct_arguments_nothing_to_analyze_not_looking(tmpdir):
     """Confirm that using the command-line interface does not crash: analyze command with correct arguments."""
     # create some temporary directories;
@@ -244,6 +254,189 @@ def test_cli_analyze_incorrect_arguments_correct_config(tmpdir):
     assert "Cannot perform analysis due to configuration" in result.output
 
 
+def test_cli_analyze_stops_validating_after_invalid_checks_file(tmpdir):
+    """Confirm that the analyze command does not validate the checks files that follow an invalid one."""
+    test_one = tmpdir.mkdir("test_one")
+    project_name = "testing"
+    configuration_directory = test_one + "/.chasten"
+    configuration_directory_path = Path(configuration_directory)
+    configuration_directory_path.mkdir()
+    configuration_file = configuration_directory_path / "config.yml"
+    configuration_file.write_text(
+        CONFIGURATION_FILE_DEFAULT_CONTENTS.replace(
+            "- checks.yml", "- invalid.yml\n    - checks.yml"
+        )
+    )
+    # the first checks file does not adhere to the schema
+    invalid_checks_file = configuration_directory_path / "invalid.yml"
+    invalid_checks_file.write_text("checks:\n  - name: 1\n")
+    checks_file = configuration_directory_path / "checks.yml"
+    checks_file.write_text(CHECKS_FILE_DEFAULT_CONTENTS)
+    result = runner.invoke(
+        main.cli,
+        [
+            "analyze",
+            project_name,
+            "--search-path",
+            test_one,
+            "--config",
+            configuration_directory,
+        ],
+    )
+    assert result.exit_code == 1
+    assert "invalid.yml" in result.output
+    assert "checks.yml" not in result.output.replace("invalid.yml", "")
+    assert "Cannot perform analysis due to configuration" in result.output
+
+
+def test_cli_analyze_skip_validate_reuses_validation(tmpdir):
+    """Confirm that the analyze command with --skip-validate reuses an earlier validation of unchanged files."""
+    test_one = tmpdir.mkdir("test_one")
+    project_name = "testing"
+    configuration_directory = test_one + "/.chasten"
+    configuration_directory_path = Path(configuration_directory)
+    configuration_directory_path.mkdir()
+    configuration_file = configuration_directory_path / "config.yml"
+    configuration_file.write_text(CONFIGURATION_FILE_DEFAULT_CONTENTS)
+    checks_file = configuration_directory_path / "checks.yml"
+    checks_file.write_text(CHECKS_FILE_DEFAULT_CONTENTS)
+    arguments = [
+        "analyze",
+        project_name,
+        "--search-path",
+        test_one,
+        "--config",
+        configuration_directory,
+        "--skip-validate",
+    ]
+    # the first analysis must validate the configuration files
+    result = runner.invoke(main.cli, arguments)
+    assert result.exit_code == 0
+    assert "Validated" in result.output
+    assert main.validation_cache_file(configuration_directory).exists()
+    # the second analysis reuses the stored validation of the unchanged
+    # files even without any of the files that were loaded in memory
+    main.clear_config_cache()
+    result = runner.invoke(main.cli, arguments)
+    assert result.exit_code == 0
+    assert "Reusing validated configuration directory" in result.output
+    assert "Validated" not in result.output
+    # a modified checks file must be validated again
+    checks_file_mtime = checks_file.stat().st_mtime_ns
+    os.utime(
+        checks_file, ns=(checks_file_mtime + 1_000_000, checks_file_mtime + 1_000_000)
+    )
+    result = runner.invoke(main.cli, arguments)
+    assert result.exit_code == 0
+    assert "Validated" in result.output
+    assert "Reusing validated configuration directory" not in result.output
+
+
+def test_cli_analyze_skip_validate_with_checks_not_encodable_as_json(tmpdir):
+    """Confirm that the analyze command with --skip-validate works for checks that cannot be stored as JSON."""
+    test_one = tmpdir.mkdir("test_one")
+    configuration_directory = test_one + "/.chasten"
+    configuration_directory_path = Path(configuration_directory)
+    configuration_directory_path.mkdir()
+    (configuration_directory_path / "config.yml").write_text(
+        CONFIGURATION_FILE_DEFAULT_CONTENTS
+    )
+    (configuration_directory_path / "checks.yml").write_text(
+        CHECKS_FILE_DEFAULT_CONTENTS.replace(
+            "pattern: './/ClassDef'",
+            "pattern: './/ClassDef'\n    count:\n      min: 0\n      since: 2023-01-01",
+        )
+    )
+    arguments = [
+        "analyze",
+        "testing",
+        "--search-path",
+        test_one,
+        "--config",
+        configuration_directory,
+        "--skip-validate",
+    ]
+    for _ in range(2):
+        result = runner.invoke(main.cli, arguments)
+        assert result.exit_code == 0
+        assert "Validated" in result.output
+    assert not main.validation_cache_file(configuration_directory).exists()
+
+
+def test_cli_analyze_without_checks_does_not_search_files(tmpdir):
+    """Confirm that the analyze command does not find or search files when all of the checks are excluded."""
+    test_one = tmpdir.mkdir("test_one")
+    configuration_directory = test_one + "/.chasten"
+    configuration_directory_path = Path(configuration_directory)
+    configuration_directory_path.mkdir()
+    (configuration_directory_path / "config.yml").write_text(
+        CONFIGURATION_FILE_DEFAULT_CONTENTS
+    )
+    (configuration_directory_path / "checks.yml").write_text(
+        CHECKS_FILE_DEFAULT_CONTENTS
+    )
+    with patch("chasten.process.collect_python_files") as collect_python_files:
+        result = runner.invoke(
+            main.cli,
+            [
+                "analyze",
+                "testing",
+                "--search-path",
+                test_one,
+                "--config",
+                configuration_directory,
+                "--check-include",
+                "id",
+                "NOPE",
+                "100",
+            ],
+        )
+    assert result.exit_code == 0
+    assert "Performing 0 check(s)" in result.output
+    collect_python_files.assert_not_called()
+
+
+def test_extract_configuration_details_uses_cache(tmp_path):
+    """Confirm that extracting the same unchanged configuration file reuses the cached contents."""
+    main.clear_config_cache()
+    configuration_file = tmp_path / "config.yml"
+    configuration_file.write_text(CONFIGURATION_FILE_DEFAULT_CONTENTS)
+    (valid, _, first_yml, first_data) = main.extract_configuration_details(
+        str(tmp_path)
+    )
+    assert valid
+    assert first_data == {"chasten": {"checks-file": ["checks.yml"]}}
+    # the second extraction of the unmodified file returns the cached objects
+    (valid, _, second_yml, second_data) = main.extract_configuration_details(
+        str(tmp_path)
+    )
+    assert valid
+    assert second_yml is first_yml
+    assert second_data is first_data
+    main.clear_config_cache()
+
+
+def test_extract_configuration_details_detects_modified_file(tmp_path):
+    """Confirm that extracting a modified configuration file does not reuse the cached contents."""
+    main.clear_config_cache()
+    checks_file = tmp_path / "checks.yml"
+    checks_file.write_text(CHECKS_FILE_DEFAULT_CONTENTS)
+    (_, _, _, first_data) = main.extract_configuration_details(
+        str(tmp_path), "checks.yml"
+    )
+    assert len(first_data["checks"]) == 5  # noqa: PLR2004
+    # modify the file and ensure that its modification time changes
+    checks_file.write_text(CHECKS_FILE_DEFAULT_CONTENTS_GOTCHA)
+    first_mtime = checks_file.stat().st_mtime_ns
+    os.utime(checks_file, ns=(first_mtime + 1_000_000, first_mtime + 1_000_000))
+    (_, _, second_yml, second_data) = main.extract_configuration_details(
+        str(tmp_path), "checks.yml"
+    )
+    assert second_yml == CHECKS_FILE_DEFAULT_CONTENTS_GOTCHA
+    assert second_data["checks"][0]["count"] == {"min": 1, "max": 10}
+    main.clear_config_cache()
+
+
 @patch("chasten.configuration.user_config_dir")
 def test_cli_configure_create_config_when_does_not_exist(
     mock_user_config_dir, tmp_path
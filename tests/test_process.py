@@ -1,57 +1,225 @@
 """Pytest test suite for the analyze module."""
 
-from pathlib import Path
-
 import pytest
-from hypothesis import given
-from hypothesis import strategies as st
+from lxml import etree
 from pyastgrep import search as pyastgrepsearch
 
 from chasten import process
 
 
-@given(
-    match_list=st.lists(
-        st.one_of(
-            st.just(
-                pyastgrepsearch.Match(
-                    path=Path("."),
-                    file_lines=None,  # type: ignore
-                    xml_element=None,
-                    position=None,  # type: ignore
-                    ast_node=None,  # type: ignore
-                )
-            ),
-            st.none(),
-        )
-    ),
-    data_type=st.just(pyastgrepsearch.Match),
+def test_extract_required_literals_keywords_and_identifiers():
+    """Confirm that the keywords for nodes and the compared identifiers are required literals."""
+    xpath = ".//FunctionDef[@name='foo']//Call/func/Attribute[@attr=\"bar\"]"
+    assert process.extract_required_literals(xpath) == ["foo", "bar", "def"]
+    assert process.extract_required_literals(".//FunctionDef/body//If") == [
+        "def",
+        "if",
+    ]
+
+
+@pytest.mark.parametrize(
+    "xpath",
+    [
+        './/FunctionDef[not(contains(@name, "test_"))]',
+        ".//FunctionDef/body//If[ancestor::If and not(parent::orelse)]",
+        ".//ClassDef | .//FunctionDef",
+        ".//FunctionDef[@name='foo' or @name='bar']",
+        ".//FunctionDef[count(body/If) = 0]",
+        ".//Name[@id != 'foo']",
+        ".//FunctionDef[(body//While, body/Pass)]",
+        ".//FunctionDef[string(body//Return) = '']",
+        ".//FunctionDef[body//Return instance of empty-sequence()]",
+        ".//FunctionDef[body//Return treat as item()*]",
+        ".//FunctionDef[(body//While => exists()) = false()]",
+        ".//FunctionDef[let $r := body//Return return true()]",
+        ".//FunctionDef[body//Return ! 1]",
+        ".//FunctionDef[(@name = 'x') = (1 = 2)]",
+        ".//FunctionDef[(body//Return) eq (body//While)]",
+        ".//FunctionDef[contains(@name, 'x') = 0]",
+        ".//FunctionDef[(@name = 'x') = 0]",
+    ],
 )
-@pytest.mark.fuzz
-def test_filter_matches(match_list, data_type):
-    """Use Hypothesis to confirm that filtering always gets the Match objects."""
-    filtered, _ = process.filter_matches(match_list, data_type)
-    assert all(isinstance(m, pyastgrepsearch.Match) for m in filtered)
-    assert set(filtered) == set(
-        m for m in match_list if isinstance(m, pyastgrepsearch.Match)
-    )
-
-
-@given(match_list=st.lists(st.integers()))
-@pytest.mark.fuzz
-def test_filter_matches_no_matches(match_list):
-    """Use Hypothesis to confirm that filtering does not select a Match when there are none."""
-    data_type = pyastgrepsearch.Match
-    filtered, _ = process.filter_matches(match_list, data_type)
-    assert filtered == []
-
-
-@given(match_list=st.lists(st.integers()), data_type=st.just(int))
-@pytest.mark.fuzz
-def test_filter_matches_only_int_matches(match_list, data_type):
-    """Use Hypothesis to confirm that filtering works for integers."""
-    filtered, _ = process.filter_matches(match_list, data_type)
-    if match_list == []:
-        assert filtered == []
-    else:
-        assert filtered != []
+def test_extract_required_literals_optional_parts(xpath):
+    """Confirm that an expression that may match without some of its nodes does not require any literals."""
+    assert process.extract_required_literals(xpath) == []
+
+
+def test_extract_required_literals_recognized_function_calls():
+    """Confirm that the functions that compare an attribute with a string still require literals."""
+    assert process.extract_required_literals(
+        ".//FunctionDef[starts-with(@name, 'test_')]//While"
+    ) == ["test_", "def", "while"]
+    assert process.extract_required_literals(".//FunctionDef[node()]") == []
+
+
+def test_search_does_not_filter_out_files_matching_without_nodes(tmp_path):
+    """Confirm that a file matching an expression without all of its nodes is still searched."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text("def f():\n    pass\n")
+    xpath_patterns = [
+        ".//FunctionDef[(body//While, body/Pass)]",
+        ".//FunctionDef[string(body//Return) = '']",
+        ".//FunctionDef[body//Return instance of empty-sequence()]",
+        ".//FunctionDef[(@name = 'x') = (1 = 2)]",
+    ]
+    [(_, matches_list)] = process.generate_python_file_matches(
+        [source_file], xpath_patterns, workers=1
+    )
+    assert [len(matches) for matches in matches_list] == [1, 1, 1, 1]
+
+
+def test_extract_required_literals_ignores_quoted_node_names():
+    """Confirm that the name of a node inside of a quoted string does not require a keyword."""
+    assert process.extract_required_literals(".//Name[@id='If']") == ["If"]
+    assert process.extract_required_literals(".//Constant[@value='If']") == []
+
+
+def test_contains_required_literals():
+    """Confirm that only the contents containing all of the required literals can match."""
+    assert process.contains_required_literals(b"class Foo:\n    pass\n", [])
+    assert process.contains_required_literals(b"class Foo:\n    pass\n", ["class"])
+    assert not process.contains_required_literals(
+        b"class Foo:\n    pass\n", ["def", "foo"]
+    )
+    assert process.contains_required_literals(
+        "\uff46\uff4f\uff4f = 1\n".encode("utf-8"), ["def", "foo"]
+    )
+
+
+def test_collect_python_files(tmp_path):
+    """Confirm that the Python source files are found and the files ignored by git are skipped."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("x = 1\n")
+    (tmp_path / "ignored.py").write_text("x = 1\n")
+    (tmp_path / ".gitignore").write_text("ignored.py\n")
+    assert process.collect_python_files([tmp_path]) == [source_file]
+
+
+def test_generate_python_file_matches_matches_pyastgrep(tmp_path, collect_matches):
+    """Confirm that searching each file once with all patterns finds the same matches as pyastgrep."""
+    (tmp_path / "first.py").write_text(
+        "class Foo:\n    def bar(self):\n        if self:\n            return 1\n"
+    )
+    (tmp_path / "second.py").write_text("def test_baz():\n    x = lambda: 1\n")
+    (tmp_path / "invalid.py").write_text("def broken(:\n")
+    xpath_patterns = [
+        ".//ClassDef",
+        './/FunctionDef[not(contains(@name, "test_"))]',
+        ".//FunctionDef/body//If",
+        ".//Lambda",
+        ".//While",
+    ]
+    python_files = process.collect_python_files([tmp_path])
+    matches_list = collect_matches(python_files, xpath_patterns)
+    for xpath_pattern, matches in zip(xpath_patterns, matches_list):
+        expected_matches = [
+            match
+            for match in pyastgrepsearch.search_python_files(
+                paths=[tmp_path], expression=xpath_pattern, xpath2=True
+            )
+            if isinstance(match, pyastgrepsearch.Match)
+        ]
+        assert sorted(
+            (str(path), position) for (path, position, _) in matches
+        ) == sorted((str(m.path), m.position) for m in expected_matches)
+    assert [len(matches) for matches in matches_list] == [1, 1, 1, 1, 0]
+
+
+def test_compile_xpath_reusable_across_trees():
+    """Confirm that a compiled XPATH expression can search many XML-based trees."""
+    xpath_selector = process.compile_xpath(".//ClassDef")
+    first_tree = etree.fromstring("<Module><body><ClassDef/></body></Module>")
+    second_tree = etree.fromstring("<Module><body><FunctionDef/></body></Module>")
+    assert len(xpath_selector.select(first_tree)) == 1
+    assert xpath_selector.select(second_tree) == []
+
+
+def test_generate_python_file_matches_parallel_matches_serial(
+    tmp_path, collect_matches
+):
+    """Confirm that searching the files in worker processes finds the same matches in the same order."""
+    for index in range(4):
+        (tmp_path / f"source_{index}.py").write_text(
+            f"class Foo{index}:\n    def bar(self):\n        if self:\n            return {index}\n"
+        )
+    xpath_patterns = [".//ClassDef", ".//FunctionDef/body//If", ".//While"]
+    python_files = process.collect_python_files([tmp_path])
+    serial_matches_list = collect_matches(python_files, xpath_patterns, workers=1)
+    parallel_matches_list = collect_matches(python_files, xpath_patterns, workers=2)
+    assert parallel_matches_list == serial_matches_list
+    assert [len(matches) for matches in parallel_matches_list] == [4, 4, 0]
+
+
+INCLUDE_OR_EXCLUDE_CHECKS = [
+    {"name": "class-definition", "code": "CDF", "id": "C001", "pattern": ".//ClassDef"},
+    {
+        "name": "all-function-definition",
+        "code": "AFD",
+        "id": "F001",
+        "pattern": ".//FunctionDef",
+    },
+]
+
+
+@pytest.mark.parametrize("include", [True, False])
+def test_include_or_exclude_checks_without_criterion_keeps_all(include):
+    """Confirm that not specifying an include or exclude criterion keeps all of the checks."""
+    filtered_checks = process.include_or_exclude_checks(
+        INCLUDE_OR_EXCLUDE_CHECKS, None, None, 0, include=include  # type: ignore
+    )
+    assert filtered_checks == INCLUDE_OR_EXCLUDE_CHECKS
+
+
+def test_include_or_exclude_checks_with_criterion():
+    """Confirm that a criterion includes or excludes only the checks that match it."""
+    included_checks = process.include_or_exclude_checks(
+        INCLUDE_OR_EXCLUDE_CHECKS, "code", "CDF", 80, include=True  # type: ignore
+    )
+    assert included_checks == [INCLUDE_OR_EXCLUDE_CHECKS[0]]
+    excluded_checks = process.include_or_exclude_checks(
+        INCLUDE_OR_EXCLUDE_CHECKS, "code", "CDF", 80, include=False  # type: ignore
+    )
+    assert excluded_checks == [INCLUDE_OR_EXCLUDE_CHECKS[1]]
+
+
+def test_collect_python_files_skips_virtual_environments(tmp_path):
+    """Confirm that the files inside of a virtual environment are skipped unless it is the provided path."""
+    source_file = tmp_path / "source.py"
+    source_file.write_text("x = 1\n")
+    virtual_environment = tmp_path / "venv"
+    (virtual_environment / "lib").mkdir(parents=True)
+    (virtual_environment / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    installed_file = virtual_environment / "lib" / "installed.py"
+    installed_file.write_text("y = 2\n")
+    assert process.collect_python_files([tmp_path]) == [source_file]
+    assert process.collect_python_files([virtual_environment]) == [installed_file]
+
+
+def test_collect_python_files_without_duplicates(tmp_path):
+    """Confirm that overlapping paths do not lead to the same file being collected more than once."""
+    first_file = tmp_path / "first.py"
+    first_file.write_text("x = 1\n")
+    second_file = tmp_path / "second.py"
+    second_file.write_text("y = 2\n")
+    python_files = process.collect_python_files([second_file, tmp_path, tmp_path])
+    assert python_files[0] == second_file
+    assert sorted(python_files) == [first_file, second_file]
+
+
+def test_generate_python_file_matches_yields_each_file(tmp_path):
+    """Confirm that the matches for each of the files are yielded in the order of the files."""
+    first_file = tmp_path / "first.py"
+    first_file.write_text("class Foo:\n    pass\n")
+    second_file = tmp_path / "second.py"
+    second_file.write_text("def bar():\n    pass\n")
+    generated = list(
+        process.generate_python_file_matches(
+            [first_file, second_file], [".//ClassDef", ".//FunctionDef"], workers=1
+        )
+    )
+    assert [python_file for python_file, _ in generated] == [first_file, second_file]
+    assert [
+        [len(file_matches) for file_matches in file_matches_list]
+        for _, file_matches_list in generated
+    ] == [[1, 0], [0, 1]]
@@ -0,0 +1,157 @@
+"""Pytest test suite for the trigram module."""
+
+import os
+import sqlite3
+
+from chasten import process, trigram
+
+
+def test_extract_trigrams():
+    """Confirm that each distinct sequence of three bytes is extracted."""
+    assert trigram.extract_trigrams(b"ab") == set()
+    assert trigram.extract_trigrams(b"abcabc") == {
+        int.from_bytes(b"abc", "big"),
+        int.from_bytes(b"bca", "big"),
+        int.from_bytes(b"cab", "big"),
+    }
+
+
+def test_extract_required_trigrams_ignores_short_literals():
+    """Confirm that the literals that are shorter than a trigram do not require any trigrams."""
+    assert trigram.extract_required_trigrams([]) == []
+    assert trigram.extract_required_trigrams(["if", "or"]) == []
+    assert trigram.extract_required_trigrams(["if", "def"]) == [
+        int.from_bytes(b"def", "big")
+    ]
+
+
+def test_filter_candidate_files(tmp_path):
+    """Confirm that only the files that contain the required literals of a pattern are candidates."""
+    class_file = tmp_path / "class_file.py"
+    class_file.write_text("class Foo:\n    pass\n")
+    function_file = tmp_path / "function_file.py"
+    function_file.write_text("def foo():\n    return 1\n")
+    unicode_file = tmp_path / "unicode_file.py"
+    unicode_file.write_text("\uff46\uff4f\uff4f = 1\n", encoding="utf-8")
+    python_files = [class_file, function_file, unicode_file]
+    index_file_path = tmp_path / "index" / "trigram.sqlite"
+    assert trigram.filter_candidate_files(
+        index_file_path, [tmp_path], python_files, [["class"]]
+    ) == [class_file, unicode_file]
+    assert trigram.filter_candidate_files(
+        index_file_path, [tmp_path], python_files, [["class"], ["def", "foo"]]
+    ) == [class_file, function_file, unicode_file]
+    assert trigram.filter_candidate_files(
+        index_file_path, [tmp_path], python_files, [["while"]]
+    ) == [unicode_file]
+    # a pattern without any trigrams could match all of the files
+    assert (
+        trigram.filter_candidate_files(
+            index_file_path, [tmp_path], python_files, [["while"], []]
+        )
+        == python_files
+    )
+
+
+def test_filter_candidate_files_updates_modified_files(tmp_path):
+    """Confirm that only a modified file is indexed again."""
+    first_file = tmp_path / "first.py"
+    first_file.write_text("class Foo:\n    pass\n")
+    second_file = tmp_path / "second.py"
+    second_file.write_text("x = 1\n")
+    index_file_path = tmp_path / "trigram.sqlite"
+    python_files = [first_file, second_file]
+    assert trigram.filter_candidate_files(
+        index_file_path, [tmp_path], python_files, [["class"]]
+    ) == [first_file]
+    second_file.write_text("class Bar:\n    pass\n")
+    first_mtime = second_file.stat().st_mtime_ns
+    os.utime(second_file, ns=(first_mtime + 1_000_000, first_mtime + 1_000_000))
+    assert (
+        trigram.filter_candidate_files(
+            index_file_path, [tmp_path], python_files, [["class"]]
+        )
+        == python_files
+    )
+    with sqlite3.connect(index_file_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM files").fetchone() == (2,)
+
+
+def test_generate_python_file_matches_with_index_matches_without_index(
+    tmp_path, collect_matches
+):
+    """Confirm that searching with the trigram index finds the same matches as searching without it."""
+    (tmp_path / "first.py").write_text(
+        "class Foo:\n    def bar(self):\n        while self:\n            return 1\n"
+    )
+    (tmp_path / "second.py").write_text("def baz():\n    x = lambda: 1\n")
+    xpath_patterns = [".//ClassDef", ".//While", './/FunctionDef[@name="baz"]']
+    python_files = process.collect_python_files([tmp_path])
+    index_file_path = tmp_path.parent / f"{tmp_path.name}-trigram.sqlite"
+    required_literals_list = [
+        process.extract_required_literals(xpath_pattern)
+        for xpath_pattern in xpath_patterns
+    ]
+    candidate_files = trigram.filter_candidate_files(
+        index_file_path, [tmp_path], python_files, required_literals_list
+    )
+    expected_matches_list = collect_matches(python_files, xpath_patterns, workers=1)
+    matches_list = collect_matches(candidate_files, xpath_patterns, workers=1)
+    assert matches_list == expected_matches_list
+    assert [len(matches) for matches in matches_list] == [1, 1, 1]
+
+
+def test_filter_candidate_files_removes_files_no_longer_found(tmp_path):
+    """Confirm that the indexed files inside of the searched paths that were not found are removed."""
+    project = tmp_path / "project"
+    project.mkdir()
+    kept_file = project / "kept.py"
+    kept_file.write_text("class Foo:\n    pass\n")
+    removed_file = project / "removed.py"
+    removed_file.write_text("class Bar:\n    pass\n")
+    other_file = tmp_path / "other.py"
+    other_file.write_text("class Baz:\n    pass\n")
+    index_file_path = tmp_path / "trigram.sqlite"
+    trigram.filter_candidate_files(
+        index_file_path, [project], [kept_file, removed_file], [["class"]]
+    )
+    trigram.filter_candidate_files(
+        index_file_path, [other_file], [other_file], [["class"]]
+    )
+    removed_file.unlink()
+    assert trigram.filter_candidate_files(
+        index_file_path, [project], [kept_file], [["class"]]
+    ) == [kept_file]
+    # the file outside of the searched paths is still indexed
+    with sqlite3.connect(index_file_path) as connection:
+        assert sorted(
+            path for (path,) in connection.execute("SELECT path FROM files")
+        ) == sorted([str(kept_file.resolve()), str(other_file.resolve())])
+        assert connection.execute(
+            "SELECT COUNT(*) FROM trigrams WHERE file_id NOT IN (SELECT id FROM files)"
+        ).fetchone() == (0,)
+
+
+def test_update_index_with_file_indexed_by_another_run(tmp_path):
+    """Confirm that a file indexed by another run after loading the indexed files is updated instead of inserted."""
+    python_file = tmp_path / "source.py"
+    python_file.write_text("class Foo:\n    pass\n")
+    index_file_path = tmp_path / "trigram.sqlite"
+    connection = trigram.connect_index(index_file_path)
+    other_connection = sqlite3.connect(index_file_path, isolation_level=None)
+    # index the same file with the other connection right before inserting it
+    connection.set_trace_callback(
+        lambda statement: statement.startswith("INSERT INTO files")
+        and other_connection.execute(
+            "INSERT OR IGNORE INTO files (path, mtime, size, ascii) VALUES (?, 0, 0, 1)",
+            (str(python_file.resolve()),),
+        )
+    )
+    try:
+        file_ids = trigram.update_index(connection, [tmp_path], [python_file])
+        assert connection.execute("SELECT id, mtime FROM files").fetchall() == [
+            (file_ids[python_file], python_file.stat().st_mtime_ns)
+        ]
+    finally:
+        connection.close()
+        other_connection.close()
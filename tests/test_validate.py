@@ -1,10 +1,16 @@
 """Pytest test suite for the validate module."""
 
+import jsonschema
 import pytest
 from hypothesis import given, strategies
 from hypothesis_jsonschema import from_schema
 
-from chasten.validate import JSON_SCHEMA_CONFIG, validate_configuration
+from chasten.validate import (
+    JSON_SCHEMA_CHECKS,
+    JSON_SCHEMA_CONFIG,
+    get_validator,
+    validate_configuration,
+)
 
 
 def test_validate_config_valid_realistic():
@@ -32,6 +38,36 @@ def test_validate_config_invalid_realistic():
     assert "is not of type" in errors
 
 
+def test_get_validator_reuses_built_in_validators():
+    """Confirm that the validators for the built-in schemas are only built once."""
+    assert get_validator(JSON_SCHEMA_CONFIG) is get_validator(JSON_SCHEMA_CONFIG)
+    assert get_validator(JSON_SCHEMA_CHECKS) is get_validator(JSON_SCHEMA_CHECKS)
+    assert get_validator(JSON_SCHEMA_CHECKS).schema is JSON_SCHEMA_CHECKS
+
+
+def test_validate_configuration_with_other_schema():
+    """Confirm that validation works for a schema that is not built-in."""
+    schema = {"type": "object", "required": ["name"]}
+    is_valid, errors = validate_configuration({"name": "chasten"}, schema)
+    assert is_valid
+    assert not errors
+    is_valid, errors = validate_configuration({}, schema)
+    assert not is_valid
+    assert "'name' is a required property" in errors
+
+
+def test_validate_checks_error_matches_jsonschema():
+    """Confirm that the reported error is the one that jsonschema.validate reports."""
+    invalid_checks = {
+        "checks": [{"name": "c", "id": 1, "pattern": ".//If", "code": "C", "x": 2}]
+    }
+    with pytest.raises(jsonschema.ValidationError) as validation_error:
+        jsonschema.validate(invalid_checks, JSON_SCHEMA_CHECKS)
+    is_valid, errors = validate_configuration(invalid_checks, JSON_SCHEMA_CHECKS)
+    assert not is_valid
+    assert errors == str(validation_error.value).lstrip()
+
+
 @given(
     config=strategies.fixed_dictionaries({"chasten": strategies.fixed_dictionaries({})})
 )